@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Audio Transcription Benchmark
+=============================
+
+Compares the transcription modes of AudioTranscriptionTool on the same
+decoded audio and diarization turns:
+  - raw_turns:   one Whisper call per diarized turn, no merging (previous behaviour)
+  - per_turn:    merged / filtered turns packed into ~30 s batches
+  - single_pass: one Whisper call with word timestamps, words aligned to the turns
+
+Decoding, voice activity detection (--vad) and diarization run once up front
+and are reported separately, so the mode timings are the transcription step
+only. Models are loaded and
+warmed up before timing.
+
+Requires openai-whisper, pyannote.audio and HF_TOKEN in .env.
+
+Usage:
+    uv run python benchmarks/audio_transcription_benchmark.py
+    uv run python benchmarks/audio_transcription_benchmark.py --audio inputs/audio_inputs/radio_conversation.mp3 --iterations 3 --show
+    uv run python benchmarks/audio_transcription_benchmark.py --vad
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+from src.tactical.tools.multimodal_tools import AudioTranscriptionTool, PER_TURN, SINGLE_PASS, merge_turns
+from src.tactical.tools.voice_activity import VoiceActivityDetector
+
+DEFAULT_AUDIO = "inputs/audio_inputs/radio_conversation.mp3"
+
+
+class CountingModel:
+    """Wraps the Whisper model to count transcribe() calls"""
+
+    def __init__(self, model):
+        self.model = model
+        self.calls = 0
+
+    def transcribe(self, audio, **kwargs):
+        self.calls += 1
+        return self.model.transcribe(audio, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-turn vs single-pass Whisper transcription")
+    parser.add_argument('--audio', default=DEFAULT_AUDIO)
+    parser.add_argument('--iterations', type=int, default=3, help="Samples per mode")
+    parser.add_argument('--show', action='store_true', help="Print the transcript of each mode")
+    parser.add_argument('--vad', action='store_true', help="Cut dead air before diarization and transcription")
+    args = parser.parse_args()
+
+    load_dotenv()
+    tool = AudioTranscriptionTool()
+    diar_pipeline = tool._load_diarization_pipeline()
+    model = CountingModel(tool._load_whisper_model())
+
+    started = time.perf_counter()
+    audio = tool._load_audio(args.audio)
+    decode_seconds = time.perf_counter() - started
+    original_seconds = len(audio) / 16000
+
+    speech_map, vad_seconds = None, 0.0
+    if args.vad:
+        started = time.perf_counter()
+        speech_map = VoiceActivityDetector().detect(audio)
+        if speech_map.regions:
+            audio = speech_map.compact(audio)
+        else:
+            speech_map = None  # same fallback as the tool: keep the untrimmed audio
+        vad_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    diarization = tool._diarize(diar_pipeline, audio, 2)
+    diarize_seconds = time.perf_counter() - started
+    diarized = sorted((turn.start, turn.end, speaker)
+                      for turn, _, speaker in diarization.itertracks(yield_label=True))
+    if speech_map is not None:
+        # Merge on the original timeline like the tool, slice on the compacted one
+        turns = speech_map.compact_turns(merge_turns(speech_map.map_turns(diarized),
+                                                     max_gap=tool.merge_gap_seconds,
+                                                     min_duration=tool.min_turn_seconds))
+    else:
+        turns = merge_turns(diarized, max_gap=tool.merge_gap_seconds, min_duration=tool.min_turn_seconds)
+
+    audio_seconds = original_seconds  # RTF against the recording length, with or without VAD
+    print("=" * 70)
+    print(f"AUDIO TRANSCRIPTION ({args.audio}: {audio_seconds:.1f}s, {len(diarized)} turns, {len(turns)} after merging)")
+    print("=" * 70)
+    print(f"  decode     {decode_seconds:8.2f} s (once)")
+    if speech_map is not None:
+        print(f"  vad        {vad_seconds:8.2f} s (once): {speech_map.summary()}")
+    print(f"  diarize    {diarize_seconds:8.2f} s (once)")
+
+    # Warm-up so the first timed mode does not pay for lazy initialisation
+    model.transcribe(audio[:16000], language=None)
+
+    modes = {
+        'raw_turns': lambda: tool._transcribe_each_turn(model, audio, diarized),
+        PER_TURN: lambda: tool._transcribe_per_turn(model, audio, turns),
+        SINGLE_PASS: lambda: tool._transcribe_single_pass(model, audio, turns)[0],
+    }
+    means, transcripts = {}, {}
+    for mode, run in modes.items():
+        samples = []
+        model.calls = 0
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            transcripts[mode] = run()
+            samples.append(time.perf_counter() - started)
+        means[mode] = statistics.mean(samples)
+        print(f"  {mode:<11} mean {means[mode]:8.2f} s   median {statistics.median(samples):8.2f} s   "
+              f"whisper calls {model.calls // args.iterations:4d}   RTF {means[mode] / audio_seconds:.3f}")
+
+    print(f"\n  speedup vs raw_turns: per_turn {means['raw_turns'] / means[PER_TURN]:.1f}x, "
+          f"single_pass {means['raw_turns'] / means[SINGLE_PASS]:.1f}x")
+
+    if args.show:
+        for mode, lines in transcripts.items():
+            print(f"\n--- {mode} ---")
+            for speaker, text in lines:
+                print(f"{speaker}: {text}")
+
+
+if __name__ == "__main__":
+    main()
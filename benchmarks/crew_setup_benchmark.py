@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Crew Setup Benchmark
+====================
+
+Measures the per-mission setup cost of the TacticalCrew:
+  - rebuild:  a fresh TacticalCrew() + crew() (a real per-alert rebuild: tools,
+              preprocessor, agents and tasks all constructed again)
+  - memoized: crew() on an existing TacticalCrew. @CrewBase memoizes agents and
+              tasks per instance, so this is cheap but every run shares them
+  - template: `crew_template().copy()` (what TacticalCrew.kickoff does per mission:
+              fresh agents and tasks per run, without rebuilding the instance)
+
+The LLM manager runs on the deterministic local fake provider so no API keys
+or network are needed. With --kickoff, full missions are also timed end to end.
+
+Usage:
+    uv run python benchmarks/crew_setup_benchmark.py --iterations 20
+    uv run python benchmarks/crew_setup_benchmark.py --iterations 5 --kickoff
+"""
+
+import io
+import os
+import sys
+import time
+import logging
+import argparse
+import statistics
+import contextlib
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tactical.config.config_loader import load_execution_config
+from src.tactical.tools.llm_manager import get_llm_manager
+
+
+def summarize(name, samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))]
+    print(f"  {name:<10} mean {statistics.mean(samples) * 1000:9.2f} ms   "
+          f"median {statistics.median(samples) * 1000:9.2f} ms   p95 {p95 * 1000:9.2f} ms")
+    return statistics.mean(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark crew rebuild vs reusable crew template")
+    parser.add_argument('--iterations', type=int, default=20, help="Samples per mode")
+    parser.add_argument('--kickoff', action='store_true', help="Also time full missions (local fake LLM)")
+    args = parser.parse_args()
+
+    # Not setLevel: every TacticalCrew() resets the root level from the config
+    logging.disable(logging.INFO)
+
+    # Create the shared manager on the local fake provider before TacticalCrew picks it up
+    llm_config = dict(load_execution_config().get('llm_manager', {}) or {})
+    llm_config['local_fake'] = dict(llm_config.get('local_fake', {}) or {}, enabled=True, exclusive=True)
+    llm_config['probe_cache_enabled'] = False
+    get_llm_manager(llm_config)
+
+    from src.crew import TacticalCrew
+
+    def fresh_crew():
+        # Mute the LLM status banner printed by every constructor
+        with contextlib.redirect_stdout(io.StringIO()):
+            crew_instance = TacticalCrew()
+            crew_instance.crew()
+        return crew_instance
+
+    rebuild = []
+    for _ in range(args.iterations):
+        started = time.perf_counter()
+        crew_instance = fresh_crew()
+        rebuild.append(time.perf_counter() - started)
+        if crew_instance.preprocessor:
+            crew_instance.preprocessor.executor.shutdown(wait=False)
+
+    crew_instance = fresh_crew()
+    memoized = []
+    for _ in range(args.iterations):
+        started = time.perf_counter()
+        crew_instance.crew()
+        memoized.append(time.perf_counter() - started)
+
+    crew_instance.crew_template()
+    template = []
+    for _ in range(args.iterations):
+        started = time.perf_counter()
+        crew_instance.crew_template().copy()
+        template.append(time.perf_counter() - started)
+
+    print("\n" + "=" * 70)
+    print(f"CREW SETUP PER MISSION ({args.iterations} iterations)")
+    print("=" * 70)
+    rebuild_mean = summarize("rebuild", rebuild)
+    summarize("memoized", memoized)
+    template_mean = summarize("template", template)
+    print(f"  Speed-up vs rebuild: {rebuild_mean / template_mean:.1f}x" if template_mean else "")
+    print("  (memoized is not isolated: every run would share the same agents and tasks)")
+
+    if args.kickoff:
+        inputs = {'mission_input': "Three armed men near the bridge.", 'location_input': None}
+        missions = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            crew_instance.kickoff(inputs=inputs)
+            missions.append(time.perf_counter() - started)
+        print("\nFULL MISSION (template + kickoff, local fake LLM)")
+        summarize("mission", missions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+MQTT Shared Subscription Benchmark
+==================================
+
+Shows that alert throughput grows with the number of consumer processes in a
+shared subscription group ($share/<group>/<topic>, MQTT v5).
+
+Each worker process joins the group and handles messages one at a time with a
+fixed synthetic cost (--work-ms, standing in for a crew run), then reports
+completion on a results topic. The driver publishes a burst of messages and
+measures messages/second for each worker count.
+
+With --consumer, each worker is the real MQTTAgentConsumer (triage, priority
+queue, work-queue workers, result publisher, configured subscribe QoS) with a
+stand-in crew whose kickoff_mission sleeps --work-ms; completions are the
+consumer's own status messages. Each consumer runs mqtt.work_queue.workers
+missions at once. --drain then sends SIGTERM to one consumer
+halfway through the burst and checks that it exits cleanly and that no alert
+is lost: its queued alerts are finished, new ones go to the rest of the group.
+
+Requires a local Mosquitto (>= 1.6) on localhost:1883:
+    cd mqtt && mosquitto -c config/mosquitto.conf
+
+Usage:
+    uv run python benchmarks/mqtt_shared_subscription_benchmark.py --workers 1 2 4 --messages 200 --work-ms 50
+    uv run python benchmarks/mqtt_shared_subscription_benchmark.py --consumer --drain --workers 2 4 --messages 100
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import signal
+import argparse
+import threading
+import multiprocessing
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mqtt.mqtt_client import MQTT_Client
+
+ALERTS_TOPIC = "bench/alerts"
+READY_TOPIC = "bench/ready"
+DONE_TOPIC = "bench/done"
+
+
+def bench_worker(host, port, group, work_seconds):
+    """One consumer of the shared group: fixed-cost handling, then report done"""
+    client_id = f"bench-worker-{os.getpid()}"
+
+    def on_connect(client, userdata, flags, rc, properties=None):
+        client.subscribe(f"$share/{group}/{ALERTS_TOPIC}", qos=1)
+
+    def on_subscribe(client, userdata, mid, reason_codes, properties=None):
+        client.publish(READY_TOPIC, client_id, qos=1)
+
+    def on_message(client, userdata, msg):
+        time.sleep(work_seconds)
+        client.publish(DONE_TOPIC, f"{client_id} {msg.payload.decode()}", qos=1)
+
+    worker = MQTT_Client(host=host, port=port, client_id=client_id,
+                         on_connect=on_connect, on_message=on_message, protocol="5")
+    worker.client.on_subscribe = on_subscribe
+    worker.client.loop_forever()
+
+
+class BenchCrew:
+    """Stands in for TacticalCrew: kickoff_mission sleeps instead of running the agents"""
+
+    def __init__(self, work_seconds):
+        self.work_seconds = work_seconds
+        self.worker_id = "consumer"
+        self.runs = 0
+
+    def kickoff_mission(self, inputs, on_stage=None):
+        from src.crew import MissionResult
+
+        self.runs += 1
+        mission = MissionResult(f"{self.worker_id} {self.runs}", inputs, os.devnull)
+        time.sleep(self.work_seconds)
+        mission.duration = self.work_seconds
+        return mission
+
+
+def consumer_worker(host, port, group, work_seconds, queue_size):
+    """One real MQTTAgentConsumer of the shared group; its status messages report completion"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    sys.stdout = open(os.devnull, 'w')  # the consumer prints every alert
+    from mqtt.alert_triage import AlertTriage
+    from mqtt.mqtt_consumer_agent import MQTTAgentConsumer
+
+    crew = BenchCrew(work_seconds)
+    consumer = MQTTAgentConsumer(topics=[ALERTS_TOPIC], crew_instance=crew,
+                                 triage=AlertTriage(rules=[], default_action='escalate'), share_group=group)
+    crew.worker_id = consumer.client_id
+    consumer.mqtt_config = dict(consumer.mqtt_config, broker={'host': host, 'port': port})
+    consumer.results_config = dict(consumer.results_config, enabled=True, status_topic=DONE_TOPIC, topics={})
+    # The whole burst lands in the local queue at once: measure throughput, not overflow
+    consumer.work_queue.max_size = max(consumer.work_queue.max_size, queue_size)
+
+    subscribe = consumer.on_connect
+
+    def on_connect(client, userdata, flags, rc, properties=None):
+        subscribe(client, userdata, flags, rc, properties)
+        client.publish(READY_TOPIC, consumer.client_id, qos=1)  # after the SUBSCRIBE on the same connection
+
+    consumer.on_connect = on_connect
+    consumer.start()  # returns once a SIGTERM drain has finished
+
+
+def done_worker_id(payload):
+    """Worker that handled a message (bench workers: "<id> <n>", consumers: status JSON)"""
+    if payload.startswith("{"):
+        return json.loads(payload)['run_id'].rsplit(" ", 1)[0]
+    return payload.split(" ", 1)[0]
+
+
+def run_round(host, port, workers, messages, work_seconds, timeout, consumer=False, drain=False):
+    """Throughput (messages/s) and per-worker counts for one worker count"""
+    group = f"bench-{uuid.uuid4().hex[:8]}"
+    ready, done = set(), {}
+    lock = threading.Lock()
+    all_ready, all_done = threading.Event(), threading.Event()
+
+    def on_connect(client, userdata, flags, rc, properties=None):
+        client.subscribe([(READY_TOPIC, 1), (DONE_TOPIC, 1)])
+
+    def on_message(client, userdata, msg):
+        with lock:
+            if msg.topic == READY_TOPIC:
+                ready.add(msg.payload.decode())
+                if len(ready) >= workers:
+                    all_ready.set()
+            else:
+                worker_id = done_worker_id(msg.payload.decode())
+                done[worker_id] = done.get(worker_id, 0) + 1
+                if sum(done.values()) >= messages:
+                    all_done.set()
+
+    driver = MQTT_Client(host=host, port=port, client_id=f"bench-driver-{group}",
+                         on_connect=on_connect, on_message=on_message, protocol="5")
+    driver.client.loop_start()
+    time.sleep(0.5)  # driver subscriptions in place before workers report ready
+
+    context = multiprocessing.get_context('spawn')
+    if consumer:
+        target, worker_args = consumer_worker, (host, port, group, work_seconds, messages)
+    else:
+        target, worker_args = bench_worker, (host, port, group, work_seconds)
+    processes = [context.Process(target=target, args=worker_args, daemon=True) for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    try:
+        if not all_ready.wait(timeout=30):
+            raise RuntimeError(f"Only {len(ready)}/{workers} workers joined group {group}")
+
+        started = time.monotonic()
+        for index in range(messages):
+            driver.client.publish(ALERTS_TOPIC, str(index), qos=1)
+        if drain:
+            # SIGTERM one consumer mid-burst: it drains, the rest of the group takes over
+            while not all_done.is_set() and sum(done.values()) < messages // 2:
+                if time.monotonic() - started > timeout:
+                    break
+                time.sleep(0.01)
+            processes[0].terminate()
+            processes[0].join(timeout=timeout)
+            exitcode = processes[0].exitcode
+            print(f"  drain: SIGTERM'd consumer exited with code {exitcode}"
+                  f"{'' if exitcode == 0 else ' (expected 0: graceful drain)'}")
+        finished = all_done.wait(timeout=timeout)
+        elapsed = time.monotonic() - started
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+        driver.client.loop_stop()
+        driver.disconnect()
+
+    with lock:
+        handled = sum(done.values())
+        per_worker = sorted(done.values(), reverse=True)
+    if not finished:
+        print(f"  WARNING: only {handled}/{messages} messages handled within {timeout:.0f}s")
+    return handled / elapsed, per_worker
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared subscription throughput vs worker count")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=1883)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--work-ms', type=float, default=50, help="Synthetic handling time per message")
+    parser.add_argument('--timeout', type=float, default=300)
+    parser.add_argument('--consumer', action='store_true',
+                        help="Workers are real MQTTAgentConsumers with a stand-in crew")
+    parser.add_argument('--drain', action='store_true',
+                        help="With --consumer: SIGTERM one consumer mid-burst and check nothing is lost")
+    args = parser.parse_args()
+    if args.drain and not args.consumer:
+        parser.error("--drain needs --consumer")
+
+    print("=" * 70)
+    print(f"SHARED SUBSCRIPTION THROUGHPUT ({args.messages} messages, {args.work_ms:.0f} ms each, "
+          f"{'MQTTAgentConsumer' if args.consumer else 'bench'} workers)")
+    print("=" * 70)
+    baseline = None
+    for workers in args.workers:
+        throughput, per_worker = run_round(
+            args.host, args.port, workers, args.messages, args.work_ms / 1000.0, args.timeout,
+            consumer=args.consumer, drain=args.drain and workers > 1  # someone has to take over
+        )
+        baseline = baseline or throughput
+        print(f"  {workers:>3} workers: {throughput:8.1f} msg/s  ({throughput / baseline:4.1f}x)  "
+              f"per worker: {per_worker}")
+
+
+if __name__ == "__main__":
+    main()
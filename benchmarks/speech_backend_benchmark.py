@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Speech Backend Benchmark
+========================
+
+Compares the speech backends of AudioTranscriptionTool on CPU. Every
+configuration runs in its own process, so the peak RAM reported is that
+backend's alone. For each one the benchmark reports:
+  - load time of the model
+  - real-time factor (RTF = transcription time / audio length; < 1 is faster than real time)
+  - peak resident memory of the process
+  - WER against the first configuration (a proxy for the accuracy lost)
+
+Transcription is one pass over the whole file (no diarization, no HF token
+needed). Configurations are backend:model_size[:compute_type].
+
+Usage:
+    uv run python benchmarks/speech_backend_benchmark.py
+    uv run python benchmarks/speech_backend_benchmark.py --configs openai-whisper:base faster-whisper:base:int8 faster-whisper:small:int8 --iterations 3
+"""
+
+import os
+import sys
+import time
+import queue
+import argparse
+import resource
+import statistics
+import multiprocessing
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_AUDIO = "inputs/audio_inputs/radio_conversation.mp3"
+DEFAULT_CONFIGS = ["openai-whisper:base", "faster-whisper:base:int8", "faster-whisper:base:float32"]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def word_error_rate(reference, hypothesis):
+    """Word-level edit distance / reference length"""
+    reference, hypothesis = reference.lower().split(), hypothesis.lower().split()
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / len(reference)
+
+
+def run_config(config, audio_path, iterations, threads, results):
+    """Child process: load one backend, transcribe `iterations` times, report"""
+    parts = config.split(":")
+    settings = {'model_size': parts[1] if len(parts) > 1 else "base", 'device': "cpu", 'cpu_threads': threads}
+    if len(parts) > 2:
+        settings['compute_type'] = parts[2]
+
+    try:
+        from src.tactical.tools.speech_backends import load_speech_backend
+
+        started = time.perf_counter()
+        backend = load_speech_backend(parts[0], **settings)
+        load_seconds = time.perf_counter() - started
+
+        audio = backend.load_audio(audio_path)
+        audio_seconds = len(audio) / 16000
+        backend.transcribe(audio[:16000 * 5])  # warm-up
+
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            result = backend.transcribe(audio)
+            samples.append(time.perf_counter() - started)
+
+        results.put({
+            'config': config,
+            'compute_type': backend.compute_type,
+            'load': load_seconds,
+            'rtf': statistics.mean(samples) / audio_seconds,
+            'audio_seconds': audio_seconds,
+            'rss_mb': peak_rss_mb(),
+            'text': result['text'].strip(),
+        })
+    except Exception as e:
+        results.put({'config': config, 'error': str(e)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Real-time factor and RAM per speech backend")
+    parser.add_argument('--audio', default=DEFAULT_AUDIO)
+    parser.add_argument('--configs', nargs='+', default=DEFAULT_CONFIGS,
+                        help="backend:model_size[:compute_type], the first one is the WER reference")
+    parser.add_argument('--iterations', type=int, default=3)
+    parser.add_argument('--threads', type=int, default=0, help="CPU threads for faster-whisper (0 = default)")
+    parser.add_argument('--show', action='store_true', help="Print each transcript")
+    parser.add_argument('--timeout', type=float, default=1800, help="Longest wait for one configuration (s)")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    reports = []
+    for config in args.configs:
+        results = context.Queue()
+        process = context.Process(target=run_config, args=(config, args.audio, args.iterations, args.threads, results))
+        process.start()
+        report = None
+        deadline = time.monotonic() + args.timeout
+        # Poll so a crashed / OOM-killed child is reported instead of hanging the benchmark
+        while report is None and time.monotonic() < deadline:
+            try:
+                report = results.get(timeout=1.0)
+            except queue.Empty:
+                if not process.is_alive():
+                    try:
+                        report = results.get(timeout=1.0)  # result put just before exiting
+                    except queue.Empty:
+                        report = {'config': config, 'error': f"process died (exit code {process.exitcode})"}
+        if report is None:
+            process.terminate()
+            report = {'config': config, 'error': f"no result within {args.timeout:.0f}s"}
+        process.join()
+        reports.append(report)
+
+    print("=" * 78)
+    print(f"SPEECH BACKENDS ({args.audio}, {args.iterations} runs each, CPU)")
+    print("=" * 78)
+    reference = next((report['text'] for report in reports if 'error' not in report), "")
+    for report in reports:
+        if 'error' in report:
+            print(f"  {report['config']:<28} ERROR: {report['error']}")
+            continue
+        print(f"  {report['config']:<28} {report['compute_type']:<8} load {report['load']:6.1f} s   "
+              f"RTF {report['rtf']:6.3f}   RAM {report['rss_mb']:7.0f} MB   "
+              f"WER vs first {word_error_rate(reference, report['text']) * 100:5.1f}%")
+
+    if args.show:
+        for report in reports:
+            if 'text' in report:
+                print(f"\n--- {report['config']} ---\n{report['text']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ from contextlib import redirect_stdout, redirect_stderr
 
 # Import your existing crew components
 from src.crew import TacticalCrew, test_enhanced_llm_connectivity
+from src.tactical.config.config_loader import load_execution_config
+from src.tactical.tools.llm_manager import get_llm_manager
 
 warnings.filterwarnings("ignore")
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
@@ -29,28 +31,15 @@ class TacticalAnalysisInterface:
         os.makedirs("output", exist_ok=True)
     
     def capture_llm_status(self) -> str:
-        """Capture LLM manager status output"""
+        """Render the shared LLM manager status snapshot (never re-probes providers)"""
         try:
-            # Create string buffer to capture output
-            output_buffer = io.StringIO()
-            
-            # Temporarily redirect stdout to capture prints
-            with redirect_stdout(output_buffer):
-                # Initialize crew to trigger LLM manager status
-                test_crew = TacticalCrew()
-            
-            # Get the captured output
-            captured_output = output_buffer.getvalue()
-            
-            # If no output captured, try to get status directly
-            if not captured_output.strip():
-                # Create a new crew instance and get status
-                temp_crew = TacticalCrew()
-                if hasattr(temp_crew, 'llm_manager'):
-                    output_buffer_direct = io.StringIO()
-                    with redirect_stdout(output_buffer_direct):
-                        temp_crew.llm_manager.print_enhanced_status()
-                    captured_output = output_buffer_direct.getvalue()
+            config = load_execution_config()
+            if not config['execution'].get('execute_LLM_manager', True):
+                return "LLM Manager disabled - using default LLM configuration"
+            
+            # First call in the process probes once; later refreshes only read the snapshot
+            manager = get_llm_manager(config.get('llm_manager', {}) or {})
+            captured_output = manager.format_enhanced_status()
             
             return captured_output if captured_output.strip() else "LLM status not available"
             
@@ -82,9 +71,8 @@ class TacticalAnalysisInterface:
     
     def get_system_status(self) -> str:
         """Get the current system status"""
-        if not self.system_status_log:
-            # Try to capture status if not already done
-            self.system_status_log = self.capture_llm_status()
+        # Cheap: reads the shared manager snapshot, so every refresh is up to date
+        self.system_status_log = self.capture_llm_status()
         
         return self.system_status_log or "System status not available yet"
     
@@ -156,15 +144,18 @@ class TacticalAnalysisInterface:
             
             progress(0.4, desc="Starting threat analysis...")
             
-            # Run the crew analysis
-            result = self.crew_instance.crew().kickoff(inputs=inputs)
+            # Run the crew analysis (own run ID and output folder, results in memory)
+            mission = self.crew_instance.kickoff_mission(inputs)
+            if not mission.ok:
+                return f"Error during analysis: {mission.error}", "", "", ""
+            result = mission.result
             
             progress(0.9, desc="Compiling results...")
             
-            # Read the output files
-            threat_analysis = self.read_output_file("output/threat_analysis_task.md")
-            situation_report = self.read_output_file("output/report_generation_task.md")
-            tactical_response = self.read_output_file("output/tactical_response_task.md")
+            # Task outputs come back in memory - no shared output files to race on
+            threat_analysis = mission.outputs.get('threat_analysis_task', "")
+            situation_report = mission.outputs.get('report_generation_task', "")
+            tactical_response = mission.outputs.get('tactical_response_task', "")
             
             # Create summary
             summary = f"""
@@ -173,6 +164,7 @@ class TacticalAnalysisInterface:
             **Input**: {input_description}
             **Location**: {location or "Auto-detected via IP"}
             **Status**: Analysis completed successfully
+            **Run ID**: {mission.run_id} (reports in `{mission.output_dir}`)
             
             **Crew Result Summary**:
             {str(result)[:500]}...
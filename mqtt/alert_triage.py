@@ -0,0 +1,204 @@
+"""
+Alert Triage
+============
+
+Rule-based fast path for MQTT alarms, applied before any crew run.
+
+Each rule matches on topic (MQTT wildcards `+` / `#`), alarm_id and/or asset_id
+(a value or a list of values; omitted = any) and/or keywords (any of them found
+in the payload text, case-insensitive) and picks an action:
+  - acknowledge: routine alarm, just logged
+  - template:    answered with a report rendered from the payload fields
+  - escalate:    sent to the TacticalCrew for full analysis
+The first matching rule wins; unmatched alarms get `default_action`.
+
+PriorityClassifier uses the same rule matching to give escalated alerts a
+priority class for the work queue.
+"""
+
+import ast
+import json
+import time
+import threading
+from typing import Any, Dict, List, Optional
+
+from paho.mqtt.client import topic_matches_sub
+
+
+ACKNOWLEDGE = "acknowledge"
+TEMPLATE = "template"
+ESCALATE = "escalate"
+ACTIONS = (ACKNOWLEDGE, TEMPLATE, ESCALATE)
+
+DEFAULT_TEMPLATE = (
+    "ROUTINE ALARM REPORT\n"
+    "Topic: {topic}\n"
+    "Asset: {asset_id} | Alarm: {alarm_id} | Time: {timestamp}\n"
+    "Context: {context}\n"
+    "Assessment: routine, handled by triage rule '{rule}' (no crew run)"
+)
+
+
+class _SafeFormat(dict):
+    """Render missing payload fields as 'n/a' instead of raising"""
+
+    def __missing__(self, key: str) -> str:
+        return "n/a"
+
+
+def _payload_text(payload: Any) -> str:
+    if isinstance(payload, (bytes, bytearray)):
+        return payload.decode('utf-8', errors='replace')
+    return str(payload)
+
+
+def parse_payload(payload: Any) -> Optional[Dict[str, Any]]:
+    """
+    Decode an alarm payload: JSON, or the Python dict repr the test producer
+    sends (`str(msg)`). Returns None for anything that is not a dict.
+    """
+    payload = _payload_text(payload)
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            data = parse(payload)
+        except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+            continue
+        return data if isinstance(data, dict) else None
+    return None
+
+
+class TriageDecision:
+    """Outcome of triaging one alarm"""
+
+    def __init__(self, action: str, rule: str, topic: str, alert: Optional[Dict[str, Any]],
+                 report: Optional[str] = None, elapsed: float = 0.0):
+        self.action = action
+        self.rule = rule
+        self.topic = topic
+        self.alert = alert
+        self.report = report
+        self.elapsed = elapsed
+
+    @property
+    def escalate(self) -> bool:
+        return self.action == ESCALATE
+
+    def __repr__(self) -> str:
+        return f"TriageDecision(action={self.action!r}, rule={self.rule!r}, elapsed={self.elapsed * 1e6:.0f}us)"
+
+
+class AlertTriage:
+    """
+    Rules table for MQTT alarms.
+
+    Args:
+        rules: List of {name, topic, alarm_id, asset_id, action, template}
+        default_action: Action for alarms no rule matches
+    """
+
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None, default_action: str = ESCALATE):
+        if default_action not in ACTIONS:
+            raise ValueError(f"Unknown triage default_action: {default_action}")
+        self.default_action = default_action
+        self.rules = [self._compile(rule, index) for index, rule in enumerate(rules or [])]
+
+        self._lock = threading.Lock()
+        self.counts = {action: 0 for action in ACTIONS}
+        self.total_time = 0.0
+
+    @staticmethod
+    def _compile(rule: Dict[str, Any], index: int) -> Dict[str, Any]:
+        action = rule.get('action', ESCALATE)
+        if action not in ACTIONS:
+            raise ValueError(f"Triage rule {index}: unknown action {action!r}")
+
+        def values(key):
+            # Stored as strings so 3 and "3" match alike
+            value = rule.get(key)
+            if value is None:
+                return None
+            return {str(v) for v in (value if isinstance(value, list) else [value])}
+
+        return {
+            'name': rule.get('name', f"rule-{index}"),
+            'topic': rule.get('topic'),
+            'alarm_id': values('alarm_id'),
+            'asset_id': values('asset_id'),
+            'keywords': [k.lower() for k in rule.get('keywords', [])] or None,
+            'action': action,
+            'template': rule.get('template', DEFAULT_TEMPLATE),
+        }
+
+    @staticmethod
+    def _matches(rule: Dict[str, Any], topic: str, alert: Optional[Dict[str, Any]], text: str = "") -> bool:
+        if rule['topic'] is not None and not topic_matches_sub(rule['topic'], topic):
+            return False
+        for key in ('alarm_id', 'asset_id'):
+            if rule[key] is not None and (alert is None or str(alert.get(key)) not in rule[key]):
+                return False
+        if rule['keywords'] is not None and not any(k in text.lower() for k in rule['keywords']):
+            return False
+        return True
+
+    def triage(self, topic: str, payload: Any) -> TriageDecision:
+        started = time.perf_counter()
+        text = _payload_text(payload)
+        alert = parse_payload(text)
+
+        decision = None
+        for rule in self.rules:
+            # Free-text payloads can only match rules without alarm_id / asset_id
+            if self._matches(rule, topic, alert, text):
+                report = None
+                if rule['action'] == TEMPLATE:
+                    report = rule['template'].format_map(_SafeFormat(alert or {}, topic=topic, rule=rule['name']))
+                decision = TriageDecision(rule['action'], rule['name'], topic, alert, report)
+                break
+        if decision is None:
+            # Unknown alarms get the default (normally a full crew run)
+            report = None
+            if self.default_action == TEMPLATE:
+                report = DEFAULT_TEMPLATE.format_map(_SafeFormat(alert or {}, topic=topic, rule='default'))
+            decision = TriageDecision(self.default_action, 'default', topic, alert, report)
+
+        decision.elapsed = time.perf_counter() - started
+        with self._lock:
+            self.counts[decision.action] += 1
+            self.total_time += decision.elapsed
+        return decision
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self.counts.values())
+            return {
+                **self.counts,
+                'total': total,
+                'avg_us': round(self.total_time / total * 1e6, 1) if total else 0.0,
+            }
+
+
+class PriorityClassifier:
+    """
+    Priority class for an alert from topic, payload fields and keywords.
+
+    Args:
+        rules: List of {name, topic, alarm_id, asset_id, keywords, priority}; first match wins
+        default: Class for alerts no rule matches
+    """
+
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None, default: str = "normal"):
+        self.default = default
+        self.rules = []
+        for index, rule in enumerate(rules or []):
+            compiled = AlertTriage._compile({**rule, 'action': ESCALATE}, index)
+            compiled['priority'] = rule.get('priority', default)
+            self.rules.append(compiled)
+
+    def classify(self, topic: str, payload: Any, alert: Optional[Dict[str, Any]] = None) -> str:
+        text = _payload_text(payload)
+        if alert is None:
+            alert = parse_payload(text)
+        for rule in self.rules:
+            if AlertTriage._matches(rule, topic, alert, text):
+                return rule['priority']
+        return self.default
@@ -0,0 +1,199 @@
+"""
+Alert Coalescer
+===============
+
+Time-window coalescing of repeated alarms. The first alarm for a key
+(topic, asset_id, alarm_id) is emitted immediately (leading edge) and opens a
+window of `window_seconds`; repeats inside the window are folded into it. When
+the window closes, a single summary alert is emitted if there were repeats,
+carrying the latest payload, the repeat count and the first/last repeat
+timestamps (`summary: True`). An alarm storm therefore costs at most two crew
+runs per key and window instead of one per message, and the first alarm is
+never delayed.
+
+Alerts without asset_id / alarm_id (free text) are never coalesced.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AlertCoalescer:
+    """
+    Args:
+        on_flush: Called with each emitted alert: first alarms from the caller of
+            add(), repeat summaries from the coalescer thread
+        window_seconds: Window opened by the first alarm of a key
+        max_keys: Open windows kept at most; beyond that the oldest is flushed early
+    """
+
+    def __init__(self, on_flush: Callable[[Dict[str, Any]], None], window_seconds: float = 10.0, max_keys: int = 1000):
+        self.on_flush = on_flush
+        self.window_seconds = float(window_seconds)
+        self.max_keys = max(1, int(max_keys))
+
+        self._windows: Dict[Tuple, Dict[str, Any]] = {}
+        self._deadlines = []  # heap of (deadline, sequence, key)
+        self._sequence = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # Metrics
+        self.received = 0
+        self.coalesced = 0
+        self.flushed = 0
+
+    @staticmethod
+    def key_for(topic: str, fields: Optional[Dict[str, Any]]) -> Optional[Tuple]:
+        if not fields or (fields.get('asset_id') is None and fields.get('alarm_id') is None):
+            return None
+        return (topic, str(fields.get('asset_id')), str(fields.get('alarm_id')))
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="mqtt-coalescer", daemon=True)
+        self._thread.start()
+
+    def add(self, alert: Dict[str, Any], fields: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Emit `alert` ({'topic', 'payload', ...}) now if it opens a window, or fold
+        it into the open window as a repeat.
+        Returns False if the alert cannot be coalesced (caller handles it directly).
+        """
+        key = self.key_for(alert['topic'], fields)
+        if key is None:
+            return False
+
+        now = time.time()
+        timestamp = (fields or {}).get('timestamp')
+        early = None
+        with self._cond:
+            self.received += 1
+            window = self._windows.get(key)
+            if window is not None:
+                if not window['count']:
+                    window['first_seen'] = now
+                    window['first_timestamp'] = timestamp
+                window['count'] += 1
+                window['last_seen'] = now
+                window['last_timestamp'] = timestamp
+                window['alert'] = alert
+                self.coalesced += 1
+                return True
+
+            if len(self._windows) >= self.max_keys:
+                early = self._pop_oldest()
+            # Repeats only: the first alarm goes out below, without waiting for the window
+            self._windows[key] = {
+                'alert': None,
+                'count': 0,
+                'first_seen': None,
+                'last_seen': None,
+                'first_timestamp': None,
+                'last_timestamp': None,
+            }
+            self._sequence += 1
+            heapq.heappush(self._deadlines, (time.monotonic() + self.window_seconds, self._sequence, key))
+            self._cond.notify_all()
+
+        if early is not None:
+            self._emit(early)
+        first = dict(alert)
+        first.update({
+            'count': 1,
+            'first_seen': datetime.fromtimestamp(now).isoformat(),
+            'last_seen': datetime.fromtimestamp(now).isoformat(),
+            'first_timestamp': timestamp,
+            'last_timestamp': timestamp,
+        })
+        self._deliver(first)
+        return True
+
+    def _pop_oldest(self) -> Optional[Dict[str, Any]]:
+        """Remove the window closest to its deadline (caller holds the lock)"""
+        while self._deadlines:
+            _, _, key = heapq.heappop(self._deadlines)
+            window = self._windows.pop(key, None)
+            if window is not None:
+                return window
+        return None
+
+    def _run(self):
+        while True:
+            due = []
+            with self._cond:
+                while self._running:
+                    if not self._deadlines:
+                        self._cond.wait()
+                        continue
+                    wait = self._deadlines[0][0] - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(timeout=wait)
+                if not self._running:
+                    return
+                now = time.monotonic()
+                while self._deadlines and self._deadlines[0][0] <= now:
+                    _, _, key = heapq.heappop(self._deadlines)
+                    window = self._windows.pop(key, None)
+                    if window is not None:
+                        due.append(window)
+            for window in due:
+                self._emit(window)
+
+    def _emit(self, window: Dict[str, Any]):
+        """Summary of a closed window's repeats (nothing if the first alarm was not repeated)"""
+        if not window['count']:
+            return
+        alert = dict(window['alert'])
+        alert.update({
+            'count': window['count'],
+            'summary': True,
+            'first_seen': datetime.fromtimestamp(window['first_seen']).isoformat(),
+            'last_seen': datetime.fromtimestamp(window['last_seen']).isoformat(),
+            'first_timestamp': window['first_timestamp'],
+            'last_timestamp': window['last_timestamp'],
+        })
+        self._deliver(alert)
+
+    def _deliver(self, alert: Dict[str, Any]):
+        with self._cond:
+            self.flushed += 1
+        try:
+            self.on_flush(alert)
+        except Exception as e:
+            logger.error(f"Coalescer flush failed: {e}")
+
+    def stop(self, flush: bool = False):
+        """Stop the timer thread; repeat summaries of open windows are emitted now with `flush`, else discarded"""
+        with self._cond:
+            self._running = False
+            pending = list(self._windows.values())
+            self._windows.clear()
+            self._deadlines.clear()
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if flush:
+            for window in pending:
+                self._emit(window)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'received': self.received,
+                'coalesced': self.coalesced,
+                'flushed': self.flushed,
+                'open_windows': len(self._windows),
+                'reduction': round(self.received / self.flushed, 1) if self.flushed else 0.0,
+            }
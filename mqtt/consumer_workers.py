@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+MQTT Consumer Workers
+=====================
+
+Runs N MQTTAgentConsumer processes that share one MQTT v5 subscription group
+($share/<group>/<topic>), so the broker load-balances alerts between them.
+Start the same command on several hosts with the same --group to scale out
+across machines.
+
+Ctrl+C / SIGTERM is forwarded to every worker, which unsubscribes, finishes
+its queued alerts (mqtt.drain_timeout_seconds) and disconnects.
+
+Usage:
+    uv run python mqtt/consumer_workers.py --workers 4 --group tactical-consumers
+"""
+
+import os
+import sys
+import signal
+import argparse
+import multiprocessing
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def run_worker(topics, group):
+    """Entry point of one worker process"""
+    # Ctrl+C reaches the whole process group; let the parent forward SIGTERM instead
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    from mqtt.mqtt_consumer_agent import MQTTAgentConsumer
+
+    consumer = MQTTAgentConsumer(topics=topics, share_group=group)
+    consumer.start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared-subscription MQTT consumer workers")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help="Consumer processes on this host")
+    parser.add_argument('--group', default='tactical-consumers', help="Shared subscription group name")
+    parser.add_argument('--topics', nargs='+', default=["Canal 1", "alerts"], help="Topics to consume")
+    args = parser.parse_args()
+
+    # Spawn: every worker builds its own crew / LLM manager from scratch
+    context = multiprocessing.get_context('spawn')
+    workers = [
+        context.Process(target=run_worker, args=(args.topics, args.group), name=f"consumer-{index}")
+        for index in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    print(f"Started {len(workers)} consumers in group '{args.group}' on topics {args.topics}")
+    print("Press Ctrl+C to drain and stop")
+
+    def forward(signum, frame):
+        print("\nDraining consumers...")
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()  # SIGTERM -> graceful drain in the worker
+
+    signal.signal(signal.SIGINT, forward)
+    signal.signal(signal.SIGTERM, forward)
+
+    for worker in workers:
+        worker.join()
+    print("All consumers stopped")
+
+
+if __name__ == '__main__':
+    main()
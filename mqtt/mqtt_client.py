@@ -4,16 +4,18 @@ import paho.mqtt.client as mqtt
 class MQTT_Client():
     
     def __init__(self, host="localhost", port=1883, client_id="test",
-                 on_connect=None, on_message=None):
+                 on_connect=None, on_message=None, protocol="3.1.1"):
         self.host = host
         self.port = port    
-        self.client = mqtt.Client(client_id=client_id) #, callback_api_version=2)
+        # MQTT v5 is needed for shared subscriptions ($share/<group>/<topic>)
+        self.protocol = mqtt.MQTTv5 if str(protocol) == "5" else mqtt.MQTTv311
+        self.client = mqtt.Client(client_id=client_id, protocol=self.protocol) #, callback_api_version=2)
         self.client.connect(host=host, port=port)
         self.client.on_connect = on_connect
         self.client.on_message = on_message
         
-    def publih_message(self, topic, message):
-        self.client.publish(topic, message)
+    def publih_message(self, topic, message, qos=0, retain=False):
+        return self.client.publish(topic, message, qos=qos, retain=retain)
     
     def disconnect(self):
         self.client.disconnect()
\ No newline at end of file
@@ -10,51 +10,166 @@ Usage:
 1. Start your Mosquitto MQTT broker: podman compose up
 2. Run this script: python mqtt_consumer_agent.py
 3. Send test messages using your mqtt_producer.py
-4. Verify that agents process the messages and generate outputs in the output/ folder
+4. Verify that agents process the messages and generate outputs in output/runs/<run_id>/
 
 The script will block the terminal while consuming messages. Use Ctrl+C to stop.
 """
 
 import sys
 import os
+import signal
+import socket
+import threading
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from mqtt.mqtt_client import MQTT_Client
+from mqtt.alert_triage import AlertTriage, PriorityClassifier, ACKNOWLEDGE, parse_payload
+from mqtt.work_queue import WorkQueue
+from mqtt.coalescer import AlertCoalescer
+from mqtt.result_publisher import ResultPublisher
 from src.crew import TacticalCrew
+from src.tactical.config.config_loader import load_execution_config
 
 
 class MQTTAgentConsumer:
     """Simple MQTT consumer that processes messages through CrewAI tactical agents"""
     
-    def __init__(self, topics=["Canal 1"], crew_instance=None):
+    def __init__(self, topics=["Canal 1"], crew_instance=None, triage=None, share_group=None):
         """
         Initialize MQTT consumer for agent processing
         
         Args:
             topics: List of MQTT topics to subscribe to
             crew_instance: TacticalCrew instance (creates new one if None)
+            triage: AlertTriage applied before the crew (built from the `mqtt.triage`
+                config section if None; only escalated alarms reach the crew)
+            share_group: MQTT v5 shared subscription group; consumers in the same
+                group (any process or host) get the messages load-balanced by the
+                broker. Defaults to `mqtt.shared_subscription` in the config.
         """
         self.topics = topics if isinstance(topics, list) else [topics]
         self.crew_instance = crew_instance or TacticalCrew()
         self.mqtt_client = None
+
+        self.mqtt_config = load_execution_config().get('mqtt', {}) or {}
+        shared_config = self.mqtt_config.get('shared_subscription', {}) or {}
+        if share_group is None and shared_config.get('enabled', False):
+            share_group = shared_config.get('group', 'tactical-consumers')
+        self.share_group = share_group
+        # Unique per process so several consumers can be connected at once
+        self.client_id = f"AgentConsumer-{socket.gethostname()}-{os.getpid()}" if share_group else "AgentConsumer"
+        self.drain_timeout = float(self.mqtt_config.get('drain_timeout_seconds', 120))
+        # QoS 1: the broker redelivers alerts that were not acknowledged (QoS 0 may lose them)
+        self.subscribe_qos = int(self.mqtt_config.get('subscribe_qos', 1))
+        self._stopping = False
+        self._stopped = threading.Event()
+        triage_config = self.mqtt_config.get('triage', {}) or {}
+        if triage is None and triage_config.get('enabled', True):
+            triage = AlertTriage(
+                rules=triage_config.get('rules', []),
+                default_action=triage_config.get('default_action', 'escalate')
+            )
+        self.triage = triage
+
+        # Escalated alerts get a priority class (topic, payload fields, keywords)
+        priority_config = self.mqtt_config.get('priority', {}) or {}
+        priority_classes = priority_config.get('classes', ['critical', 'high', 'normal', 'low'])
+        self.priority_classifier = PriorityClassifier(
+            rules=priority_config.get('rules', []),
+            default=priority_config.get('default', 'normal')
+        )
+
+        # Escalated alerts are run by a worker pool, never on paho's network loop
+        queue_config = self.mqtt_config.get('work_queue', {}) or {}
+        self.work_queue = WorkQueue(
+            handler=self.process_alert,
+            max_size=queue_config.get('max_size', 100),
+            workers=queue_config.get('workers', 2),
+            overflow=queue_config.get('overflow', 'drop_oldest'),
+            block_timeout=float(queue_config.get('block_timeout_seconds', 5)),
+            classes=priority_classes,
+            aging_seconds=float(priority_config.get('aging_seconds', 60))
+        )
+
+        # Repeats of the same (topic, asset_id, alarm_id) within a window become one crew run
+        coalescing_config = self.mqtt_config.get('coalescing', {}) or {}
+        self.coalescer = None
+        self.coalescing_bypass = set(coalescing_config.get('bypass_priorities', ['critical']))
+        if coalescing_config.get('enabled', True):
+            self.coalescer = AlertCoalescer(
+                on_flush=self.enqueue_alert,
+                window_seconds=float(coalescing_config.get('window_seconds', 10)),
+                max_keys=coalescing_config.get('max_keys', 1000)
+            )
+
+        # Crew stage results are streamed back to MQTT (publisher bound in start())
+        self.results_config = self.mqtt_config.get('results', {}) or {}
+        self.result_publisher = None
         
-    def on_connect(self, client, userdata, flags, rc):
-        """Callback for MQTT connection"""
+    def subscription_topics(self):
+        """Topic filters to subscribe to ($share/<group>/<topic> in a shared group)"""
+        if self.share_group:
+            return [f"$share/{self.share_group}/{topic}" for topic in self.topics]
+        return list(self.topics)
+
+    def on_connect(self, client, userdata, flags, rc, properties=None):
+        """Callback for MQTT connection (`properties` is only passed with MQTT v5)"""
         if rc == 0:
             print("Connected to MQTT broker successfully")
             # Subscribe to all specified topics
-            for topic in self.topics:
-                client.subscribe(topic)
-                print(f"Subscribed to topic: {topic}")
+            for topic in self.subscription_topics():
+                client.subscribe(topic, qos=self.subscribe_qos)
+                print(f"Subscribed to topic: {topic} (QoS {self.subscribe_qos})")
         else:
             print(f"Connection failed with code: {rc}")
 
     def on_message(self, client, userdata, msg):
-        """Callback for received MQTT messages - processes through agents"""
+        """Callback for received MQTT messages - triages inline, queues escalations for the agents"""
         print(f"\nReceived MQTT message on topic '{msg.topic}': {msg.payload.decode()}")
         
+        # Fast path: routine alarms are handled by the rules table without a crew run
+        alert_fields = None
+        if self.triage is not None:
+            decision = self.triage.triage(msg.topic, msg.payload)
+            alert_fields = decision.alert
+            if not decision.escalate:
+                if decision.action == ACKNOWLEDGE:
+                    print(f"Triage: acknowledged by rule '{decision.rule}' ({decision.elapsed * 1e6:.0f} us)")
+                else:
+                    print(f"Triage: template report by rule '{decision.rule}' ({decision.elapsed * 1e6:.0f} us)")
+                    print(decision.report)
+                return
+            print(f"Triage: escalated by rule '{decision.rule}' - queued for tactical crew")
+        
+        if alert_fields is None:
+            alert_fields = parse_payload(msg.payload)
+        priority = self.priority_classifier.classify(msg.topic, msg.payload, alert_fields)
+        alert = {'topic': msg.topic, 'payload': msg.payload.decode(), 'priority': priority, 'count': 1}
+        
+        # First alarms go straight out, repeats are folded into a summary (critical ones bypass it)
+        if (self.coalescer is not None and priority not in self.coalescing_bypass
+                and self.coalescer.add(alert, alert_fields)):
+            return
+        self.enqueue_alert(alert)
+
+    def enqueue_alert(self, alert):
+        """
+        Hand off to the worker pool so the network loop stays responsive;
+        higher-priority alerts jump ahead of pending lower-priority ones
+        """
+        if not self.work_queue.submit(alert, priority=alert['priority']):
+            print(f"Work queue full - {alert['priority']} alert from '{alert['topic']}' dropped")
+
+    def process_alert(self, alert):
+        """Run one queued alert through the tactical crew (worker thread); raises if the mission failed"""
         # Convert MQTT message to tactical input format
-        mission_input = f"MQTT Alert from {msg.topic}: {msg.payload.decode()}"
+        mission_input = f"MQTT Alert from {alert['topic']}: {alert['payload']}"
+        if alert.get('summary'):
+            mission_input += (
+                f"\n(Update to an alarm already reported: repeated {alert['count']} more time(s) between "
+                f"{alert.get('first_timestamp') or alert['first_seen']} and "
+                f"{alert.get('last_timestamp') or alert['last_seen']})"
+            )
         
         # Process the message through the tactical crew
         try:
@@ -65,40 +180,128 @@ class MQTTAgentConsumer:
                 'location_input': None  # Auto-detect location via IP
             }
             
-            result = self.crew_instance.crew().kickoff(inputs=inputs)
+            # Reuses the pre-built crew template (no per-alert agent/task setup);
+            # each alert gets its own run folder so reports are never overwritten
+            on_stage = None
+            if self.result_publisher is not None:
+                # Each stage goes out as soon as it is done, not after the whole crew
+                on_stage = self.result_publisher.stage_callback(alert)
+            mission = self.crew_instance.kickoff_mission(inputs, on_stage=on_stage)
+            if self.result_publisher is not None:
+                self.result_publisher.publish_status(mission, alert, on_stage)
+            if not mission.ok:
+                raise RuntimeError(mission.error)
             
             print("Agent processing completed successfully!")
-            print("Check the output/ folder for generated reports")
+            print(f"Check the {mission.output_dir}/ folder for generated reports")
+            print(self.format_queue_waits())
             print("-" * 50)
             
         except Exception as e:
             print(f"Error processing message with agents: {e}")
+            raise  # counted as failed by the work queue
+
+    def format_queue_waits(self):
+        """One-line queue status with the wait latency of each priority class"""
+        snapshot = self.work_queue.snapshot()
+        classes = " | ".join(
+            f"{name} avg {stats['avg_wait']:.1f}s max {stats['max_wait']:.1f}s ({stats['depth']} queued)"
+            for name, stats in snapshot['classes'].items() if stats['submitted']
+        )
+        return f"Queue wait: {classes or 'no alerts yet'} | preempted {snapshot['preempted']}"
 
     def start(self):
         """Start consuming MQTT messages"""
         print("Initializing MQTT Agent Consumer...")
         
+        broker_config = self.mqtt_config.get('broker', {}) or {}
         self.mqtt_client = MQTT_Client(
-            client_id="AgentConsumer",
+            host=broker_config.get('host', 'localhost'),
+            port=int(broker_config.get('port', 1883)),
+            client_id=self.client_id,
             on_connect=self.on_connect,
-            on_message=self.on_message
+            on_message=self.on_message,
+            # Shared subscriptions need MQTT v5
+            protocol="5" if self.share_group else broker_config.get('protocol', '3.1.1')
         )
         
+        if self.results_config.get('enabled', True):
+            self.result_publisher = ResultPublisher(
+                publish=self.mqtt_client.publih_message,
+                topics=self.results_config.get('topics'),
+                status_topic=self.results_config.get('status_topic', 'tactical/results/status'),
+                qos=self.results_config.get('qos', 1),
+                retain=self.results_config.get('retain', False),
+                max_output_chars=self.results_config.get('max_output_chars', 0)
+            )
+            print(f"Publishing crew results to {', '.join(self.result_publisher.topics.values())}")
+        
+        self.work_queue.start()
+        print(f"Work queue: {self.work_queue.num_workers} workers, max {self.work_queue.max_size} "
+              f"queued alerts ({self.work_queue.overflow} when full)")
+        if self.coalescer is not None:
+            self.coalescer.start()
+            print(f"Coalescing repeated alarms over {self.coalescer.window_seconds:.0f}s windows")
+        
+        if self.share_group:
+            print(f"Shared subscription group '{self.share_group}' as {self.client_id}")
+        
         print("Starting MQTT consumer (blocking mode)...")
         print("Press Ctrl+C to stop")
         
+        # SIGTERM (process managers, consumer_workers.py) drains like Ctrl+C;
+        # signal handlers can only be installed from the main thread, so when the
+        # consumer runs on a thread (src/main.py) the caller installs it instead
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.request_stop())
+        
+        # The network loop runs in the background so it keeps serving
+        # keepalives while the consumer drains on shutdown
+        self.mqtt_client.client.loop_start()
         try:
-            # This will block until interrupted
-            self.mqtt_client.client.loop_forever()
+            # This will block until stopped
+            while not self._stopped.wait(timeout=0.5):
+                pass
         except KeyboardInterrupt:
             print("\nStopping MQTT consumer...")
             self.stop()
+        finally:
+            self.mqtt_client.client.loop_stop()
 
-    def stop(self):
-        """Stop the MQTT consumer"""
+    def request_stop(self):
+        """Start a graceful stop without blocking the caller (e.g. a signal handler)"""
+        threading.Thread(target=self.stop, name="mqtt-drain", daemon=True).start()
+
+    def stop(self, drain=True):
+        """
+        Stop the MQTT consumer.
+        
+        With `drain`, the consumer first unsubscribes (so the broker sends new
+        messages to the other members of its shared group), flushes open
+        coalescing windows and lets the workers finish the queued alerts (up to
+        drain_timeout_seconds) before disconnecting. Otherwise pending alerts
+        are discarded.
+        """
+        if self._stopping:
+            return
+        self._stopping = True
+        
+        if self.mqtt_client and drain:
+            for topic in self.subscription_topics():
+                self.mqtt_client.client.unsubscribe(topic)
+            print("Unsubscribed - draining pending alerts...")
+        if self.coalescer is not None:
+            self.coalescer.stop(flush=drain)
+            print(f"Coalescer stopped: {self.coalescer.snapshot()}")
+        self.work_queue.stop(drain=drain, timeout=self.drain_timeout if drain else 5)
+        print(f"Work queue stopped: {self.work_queue.snapshot()}")
+        if self.result_publisher is not None:
+            print(f"Result publisher: {self.result_publisher.snapshot()}")
+        
         if self.mqtt_client:
             self.mqtt_client.disconnect()
             print("MQTT consumer disconnected")
+        self._stopped.set()
 
 
 if __name__ == '__main__':
@@ -11,7 +11,7 @@ Usage:
 2. Start the MQTT consumer: python mqtt/mqtt_consumer_agent.py
 3. Run this producer: python mqtt/mqtt_producer.py
 4. Watch the consumer process messages through tactical agents
-5. Check output/ folder for generated threat analysis reports
+5. Check output/runs/<run_id>/ folders for generated threat analysis reports
 
 The script sends simulated tactical alerts (alarm messages) that mimic
 real-world scenarios for testing the agent processing pipeline.
@@ -0,0 +1,124 @@
+"""
+Result Publisher
+================
+
+Streams crew results of MQTT-triggered missions back to MQTT. Each stage
+(threat analysis, SITREP, tactical response) is published to its own result
+topic as soon as that task finishes, followed by a final status message, so
+downstream systems subscribe instead of polling output files.
+
+Messages are compact JSON:
+    {"run_id", "stage", "source_topic", "priority", "occurrences",
+     "output", "timings", "elapsed"}
+"""
+
+import json
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOPICS = {
+    'threat_analysis_task': "tactical/results/threat_analysis",
+    'report_generation_task': "tactical/results/sitrep",
+    'tactical_response_task': "tactical/results/tactical_response",
+}
+DEFAULT_STATUS_TOPIC = "tactical/results/status"
+MQTT_ERR_SUCCESS = 0  # paho.mqtt.client.MQTT_ERR_SUCCESS
+
+
+class ResultPublisher:
+    """
+    Args:
+        publish: `publish(topic, payload, qos, retain)`, e.g. MQTT_Client.publih_message;
+            a returned MQTTMessageInfo whose `rc` is not MQTT_ERR_SUCCESS counts as failed
+        topics: Task name -> result topic (tasks missing here are not published)
+        status_topic: Topic for the final ok/error message of each run (None = off)
+        qos: MQTT QoS of result messages
+        retain: Retain the last result on each topic for late subscribers
+        max_output_chars: Truncate stage outputs longer than this (0 = no limit)
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[str, str, int, bool], Any],
+        topics: Optional[Dict[str, str]] = None,
+        status_topic: Optional[str] = DEFAULT_STATUS_TOPIC,
+        qos: int = 1,
+        retain: bool = False,
+        max_output_chars: int = 0
+    ):
+        self.publish = publish
+        self.topics = dict(DEFAULT_TOPICS if topics is None else topics)
+        self.status_topic = status_topic
+        self.qos = int(qos)
+        self.retain = bool(retain)
+        self.max_output_chars = int(max_output_chars or 0)
+
+        self._lock = threading.Lock()
+        self.published = 0
+        self.failed = 0
+
+    def _send(self, topic: str, message: Dict[str, Any]):
+        payload = json.dumps(message, separators=(',', ':'), ensure_ascii=False, default=str)
+        try:
+            info = self.publish(topic, payload, self.qos, self.retain)
+            # paho reports most failures (no connection, queue full) in rc, not by raising
+            rc = getattr(info, 'rc', MQTT_ERR_SUCCESS)
+            if rc != MQTT_ERR_SUCCESS:
+                raise RuntimeError(f"publish returned rc={rc}")
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            logger.warning(f"Could not publish result to '{topic}': {e}")
+            return
+        with self._lock:
+            self.published += 1
+
+    def _base(self, mission: Any, alert: Dict[str, Any], started: float) -> Dict[str, Any]:
+        return {
+            'run_id': mission.run_id,
+            'source_topic': alert.get('topic'),
+            'priority': alert.get('priority'),
+            'occurrences': alert.get('count', 1),
+            'timings': {stage: round(seconds, 3) for stage, seconds in mission.timings.items()},
+            'elapsed': round(time.monotonic() - started, 3),
+        }
+
+    def stage_callback(self, alert: Dict[str, Any]) -> Callable[[Any, str, str], None]:
+        """`on_stage` callback for TacticalCrew.kickoff_mission that publishes each stage"""
+        started = time.monotonic()
+
+        def on_stage(mission: Any, task_name: str, output: str):
+            topic = self.topics.get(task_name)
+            if not topic:
+                return
+            if self.max_output_chars and len(output) > self.max_output_chars:
+                output = output[:self.max_output_chars] + "...[truncated]"
+            message = self._base(mission, alert, started)
+            message.update({'stage': task_name, 'output': output})
+            self._send(topic, message)
+
+        on_stage.started = started
+        return on_stage
+
+    def publish_status(self, mission: Any, alert: Dict[str, Any], on_stage: Optional[Callable] = None):
+        """Final message of a run: ok / error, total duration and stage timings"""
+        if not self.status_topic:
+            return
+        started = getattr(on_stage, 'started', time.monotonic() - mission.duration)
+        message = self._base(mission, alert, started)
+        message.update({
+            'stage': 'status',
+            'ok': mission.ok,
+            'error': mission.error,
+            'duration': round(mission.duration, 3),
+            'output_dir': mission.output_dir,
+        })
+        self._send(self.status_topic, message)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {'published': self.published, 'failed': self.failed}
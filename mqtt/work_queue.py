@@ -0,0 +1,253 @@
+"""
+Work Queue
+==========
+
+Bounded queue + worker pool that decouples slow crew runs from paho's network
+loop: `on_message` only enqueues, so keepalives and acks keep flowing while
+missions run on the workers.
+
+Items carry a priority class (`classes`, most urgent first). Workers always
+take the item with the best effective rank, where waiting `aging_seconds`
+improves an item's rank by one class so low-priority work is never starved.
+
+When the queue is full, a new item first preempts (evicts) the oldest queued
+item of a strictly lower class, if there is one (metric: preempted). Queued
+work of the same or a more urgent class is never evicted; `overflow` decides:
+  - drop_oldest: the new item is dropped (metric: dropped)
+  - block:       the caller waits up to `block_timeout` seconds for room, then rejects
+  - reject:      the new item is refused (metric: rejected)
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+REJECT = "reject"
+OVERFLOW_POLICIES = (DROP_OLDEST, BLOCK, REJECT)
+
+
+class WorkQueue:
+    """
+    Args:
+        handler: Called with each item on a worker thread
+        max_size: Maximum queued (not yet running) items
+        workers: Worker threads draining the queue
+        overflow: drop_oldest | block | reject
+        block_timeout: Longest wait for room with `block` (keep it short: the
+            caller is usually the MQTT network loop)
+        classes: Priority class names, most urgent first
+        aging_seconds: Queue wait that promotes an item by one class (0 = no aging)
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], None],
+        max_size: int = 100,
+        workers: int = 2,
+        overflow: str = DROP_OLDEST,
+        block_timeout: float = 5.0,
+        classes: Optional[List[str]] = None,
+        aging_seconds: float = 0.0
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.handler = handler
+        self.max_size = max(1, int(max_size))
+        self.num_workers = max(1, int(workers))
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.classes = list(classes or ['normal'])
+        self.aging_seconds = float(aging_seconds or 0.0)
+
+        # One FIFO per class; index = rank (0 = most urgent)
+        self._queues = [deque() for _ in self.classes]
+        self._size = 0
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._running = False
+        self._closed = False  # set by stop(); no new items after that
+        self.active = 0
+
+        # Metrics
+        self.submitted = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.preempted = 0
+        self.max_depth = 0
+        self.total_wait = 0.0
+        self.class_stats = {name: {'submitted': 0, 'started': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+                            for name in self.classes}
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        for index in range(self.num_workers):
+            worker = threading.Thread(target=self._work, name=f"mqtt-worker-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def rank_of(self, priority: Optional[str]) -> int:
+        """Rank of a class name (unknown / None -> least urgent class)"""
+        try:
+            return self.classes.index(priority)
+        except ValueError:
+            return len(self.classes) - 1
+
+    def _lowest_rank(self) -> int:
+        for rank in range(len(self._queues) - 1, -1, -1):
+            if self._queues[rank]:
+                return rank
+        return -1
+
+    def _evict(self, rank: int):
+        self._queues[rank].popleft()
+        self._size -= 1
+
+    def submit(self, item: Any, priority: Optional[str] = None) -> bool:
+        """Queue an item in its priority class; returns False if it was dropped or rejected"""
+        rank = self.rank_of(priority)
+        with self._cond:
+            if self._size >= self.max_size:
+                lowest = self._lowest_rank()
+                if lowest > rank:
+                    # Higher-priority alert takes the place of pending lower-priority work
+                    self._evict(lowest)
+                    self.preempted += 1
+                    logger.warning(f"Work queue full ({self.max_size}): {self.classes[rank]} item "
+                                   f"preempted a queued {self.classes[lowest]} item")
+                elif self.overflow == DROP_OLDEST:
+                    # Nothing less urgent to make room from: the queued work is older or more urgent
+                    self.dropped += 1
+                    logger.warning(f"Work queue full ({self.max_size}): dropped new {self.classes[rank]} item")
+                    return False
+                elif self.overflow == BLOCK:
+                    deadline = time.monotonic() + self.block_timeout
+                    while self._size >= self.max_size and not self._closed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(timeout=remaining)
+
+            if self._size >= self.max_size or self._closed:
+                self.rejected += 1
+                logger.warning(f"Work queue full ({self.max_size}): rejected {self.classes[rank]} item")
+                return False
+
+            self._queues[rank].append((time.monotonic(), item))
+            self._size += 1
+            self.submitted += 1
+            self.class_stats[self.classes[rank]]['submitted'] += 1
+            self.max_depth = max(self.max_depth, self._size)
+            self._cond.notify_all()
+            return True
+
+    def _pick(self) -> int:
+        """Class whose head item has the best effective (aged) rank; ties go to the older item"""
+        now = time.monotonic()
+        best, best_key = -1, None
+        for rank, queue in enumerate(self._queues):
+            if not queue:
+                continue
+            enqueued = queue[0][0]
+            effective = rank
+            if self.aging_seconds > 0:
+                effective = rank - (now - enqueued) / self.aging_seconds
+            key = (effective, enqueued)
+            if best_key is None or key < best_key:
+                best, best_key = rank, key
+        return best
+
+    def _next(self) -> Optional[tuple]:
+        """Block until an item is available (None once stopped and drained)"""
+        with self._cond:
+            while not self._size:
+                if not self._running:
+                    return None
+                self._cond.wait()
+            rank = self._pick()
+            enqueued, item = self._queues[rank].popleft()
+            self._size -= 1
+            waited = time.monotonic() - enqueued
+            self.total_wait += waited
+            stats = self.class_stats[self.classes[rank]]
+            stats['started'] += 1
+            stats['total_wait'] += waited
+            stats['max_wait'] = max(stats['max_wait'], waited)
+            self.active += 1
+            self._cond.notify_all()  # room for blocked submitters
+            return enqueued, item
+
+    def _work(self):
+        while True:
+            entry = self._next()
+            if entry is None:
+                return
+            _, item = entry
+            try:
+                self.handler(item)
+                ok = True
+            except Exception as e:
+                logger.error(f"Work queue handler failed: {e}")
+                ok = False
+            with self._cond:
+                self.active -= 1
+                if ok:
+                    self.processed += 1
+                else:
+                    self.failed += 1
+                self._cond.notify_all()
+
+    def stop(self, drain: bool = True, timeout: Optional[float] = None):
+        """
+        Stop the workers. With `drain`, queued items are processed first;
+        otherwise they are discarded (counted as dropped).
+        """
+        with self._cond:
+            self._running = False
+            self._closed = True
+            if not drain:
+                self.dropped += self._size
+                for queue in self._queues:
+                    queue.clear()
+                self._size = 0
+            self._cond.notify_all()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for worker in self._workers:
+            worker.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            taken = self.processed + self.failed + self.active
+            return {
+                'depth': self._size,
+                'max_depth': self.max_depth,
+                'active': self.active,
+                'submitted': self.submitted,
+                'processed': self.processed,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'rejected': self.rejected,
+                'preempted': self.preempted,
+                'avg_wait': round(self.total_wait / taken, 3) if taken else 0.0,
+                'classes': {
+                    name: {
+                        'depth': len(self._queues[rank]),
+                        'submitted': stats['submitted'],
+                        'started': stats['started'],
+                        'avg_wait': round(stats['total_wait'] / stats['started'], 3) if stats['started'] else 0.0,
+                        'max_wait': round(stats['max_wait'], 3),
+                    }
+                    for rank, (name, stats) in enumerate(self.class_stats.items())
+                },
+            }
@@ -1,14 +1,19 @@
 import os
+import time
+import uuid
 import yaml
+import asyncio
 import logging
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from dotenv import load_dotenv
 from crewai import Agent, Crew, Process, Task, LLM
 from crewai.project import CrewBase, agent, crew, task
 
 from src.tactical.config.config_loader import load_execution_config
 
-from src.tactical.tools.llm_manager import LLMManager
+from src.tactical.tools.llm_manager import get_llm_manager
 from src.tactical.tools.multimodal_tools import (
     AudioTranscriptionTool,
     DocumentAnalysisTool,
@@ -17,6 +22,9 @@ from src.tactical.tools.multimodal_tools import (
 from src.tactical.tools.location_tools import LocationContextTool
 from src.tactical.tools.classification_tool import ClassificationReferenceTool
 from src.tactical.tools.exif_tools import ExifMetadataExtractor, GPSFromExifTool
+from src.tactical.tools.preprocessing import MissionPreprocessor, PREPROCESSING_DISABLED
+from src.tactical.tools.voice_activity import VoiceActivityDetector
+from src.tactical.tools.speech_backends import SPEECH_SETTINGS
 
 
 
@@ -30,6 +38,55 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Tasks in execution order (keys of tasks.yaml)
+MISSION_TASKS = ('threat_analysis_task', 'report_generation_task', 'tactical_response_task')
+
+
+def new_run_id() -> str:
+    """Sortable, collision-free mission run ID (e.g. 20250101-120000-1a2b3c4d)"""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+class MissionResult:
+    """
+    In-memory result of one mission run.
+
+    `outputs` maps each task name to its raw text; `output_dir` is the run's own
+    folder where CrewAI also wrote the reports. `timings` holds seconds per stage
+    (crew setup, preprocessing, then each task in order). `error` is set instead
+    of `result` when the run failed.
+    """
+
+    def __init__(self, run_id: str, inputs: Dict[str, Any], output_dir: str):
+        self.run_id = run_id
+        self.inputs = inputs
+        self.output_dir = output_dir
+        self.result = None
+        self.outputs: Dict[str, str] = {}
+        self.timings: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self.duration = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'run_id': self.run_id,
+            'inputs': self.inputs,
+            'output_dir': self.output_dir,
+            'ok': self.ok,
+            'error': self.error,
+            'duration': round(self.duration, 3),
+            'timings': {stage: round(seconds, 3) for stage, seconds in self.timings.items()},
+            'outputs': self.outputs,
+        }
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"MissionResult(run_id={self.run_id!r}, {status}, duration={self.duration:.1f}s)"
+
 @CrewBase
 class TacticalCrew:
     """Tactical Response Crew with LLM support and multimodal processing"""
@@ -44,15 +101,18 @@ class TacticalCrew:
         config = load_execution_config()
         self.exec_config = config['execution']
         self.log_config = config.get('logging', {})
+        self.llm_config = config.get('llm_manager', {}) or {}
+        self.mission_config = config.get('missions', {}) or {}
+        self.preprocessing_config = config.get('preprocessing', {}) or {}
+        self.audio_config = config.get('audio', {}) or {}
 
         # Apply logging configuration
         log_level = getattr(logging, self.log_config.get('level', 'INFO'))
         logging.getLogger().setLevel(log_level)
 
-        # Initialize LLM Manager if enabled
+        # Use the process-wide LLM Manager if enabled (probed only once per process)
         if self.exec_config.get('execute_LLM_manager', True):
-            from src.tactical.tools.llm_manager import LLMManager
-            self.llm_manager = LLMManager()
+            self.llm_manager = get_llm_manager(self.llm_config)
             if self.log_config.get('show_llm_status', True):
                 self.llm_manager.print_enhanced_status()
         else:
@@ -61,9 +121,24 @@ class TacticalCrew:
         
         # Initialize multimodal processing and custom tools
         self.custom_tools = self._setup_custom_tools()
+
+        # Deterministic extractors run before kickoff (reuses the crew's tool instances)
+        self.preprocessor = None
+        if self.preprocessing_config.get('enabled', True):
+            self.preprocessor = MissionPreprocessor(
+                self.custom_tools,
+                max_workers=int(self.preprocessing_config.get('max_workers', 4)),
+                timeout_seconds=float(self.preprocessing_config.get('timeout_seconds', 300))
+            )
+
+        # Crew built once and copied for every kickoff (see crew_template)
+        self._crew_template = None
+        self._crew_template_lock = threading.Lock()
     
     def _setup_custom_tools(self):
         """Initialize the multimodal processing and location tools"""
+        turns_config = self.audio_config.get('turns', {}) or {}
+        vad_config = dict(self.audio_config.get('vad', {}) or {})
         return [
             # Classification system
             ClassificationReferenceTool(),
@@ -74,7 +149,16 @@ class TacticalCrew:
             
             # Multimodal processing
             InputTypeDeterminerTool(),
-            AudioTranscriptionTool(),
+            AudioTranscriptionTool(
+                speech_backend=self.audio_config.get('backend', 'openai-whisper'),
+                speech_settings={key: self.audio_config[key] for key in SPEECH_SETTINGS
+                                 if self.audio_config.get(key) is not None},
+                transcription_mode=self.audio_config.get('transcription_mode', 'single_pass'),
+                merge_gap_seconds=float(turns_config.get('merge_gap_seconds', 0.5)),
+                min_turn_seconds=float(turns_config.get('min_turn_seconds', 0.3)),
+                batch_seconds=float(turns_config.get('batch_seconds', 30)),
+                vad=VoiceActivityDetector(**vad_config) if vad_config.pop('enabled', True) else None
+            ),
             DocumentAnalysisTool(),
             
             # Geolocation
@@ -224,6 +308,156 @@ class TacticalCrew:
             logger.error(f"❌ Failed to create crew: {e}")
             raise RuntimeError(f"Cannot create crew: {e}")
 
+    def crew_template(self) -> Crew:
+        """
+        Crew built once per TacticalCrew and reused as a template.
+        Never kick it off directly: use kickoff(), which runs on a copy.
+        """
+        with self._crew_template_lock:
+            if self._crew_template is None:
+                self._crew_template = self.crew()
+            return self._crew_template
+
+    def preprocess(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return `inputs` with `preprocessed_context` filled in: the reports of the
+        extractors relevant to mission_input, run concurrently in Python.
+        """
+        inputs = dict(inputs)
+        if 'preprocessed_context' in inputs:
+            return inputs
+        if self.preprocessor is None:
+            inputs['preprocessed_context'] = PREPROCESSING_DISABLED
+            return inputs
+
+        preprocessed = self.preprocessor.run(inputs.get('mission_input'), inputs.get('location_input'))
+        inputs['preprocessed_context'] = preprocessed['context']
+        logger.info(
+            f"Preprocessed {preprocessed['input_type']} input: "
+            + ", ".join(f"{name} {seconds:.1f}s" for name, seconds in preprocessed['timings'].items())
+        )
+        return inputs
+
+    def kickoff(
+        self,
+        inputs: Optional[Dict[str, Any]] = None,
+        task_callback: Optional[Callable[[Any], None]] = None
+    ) -> Any:
+        """
+        Run the mission on a fresh copy of the cached crew template.
+        Copying skips rebuilding agents, tools and tasks from the YAML config,
+        while each run still gets its own agents, tasks and outputs.
+        Inputs are preprocessed first unless they already carry preprocessed_context.
+
+        Args:
+            inputs: Task inputs (mission_input, location_input, ...)
+            task_callback: Called with each TaskOutput as its task completes
+        """
+        inputs = self.preprocess(inputs or {})
+        # Task output files are templated on {output_dir} (tasks.yaml)
+        inputs.setdefault('output_dir', 'output')
+        crew = self.crew_template().copy()
+        if task_callback is not None:
+            crew.task_callback = task_callback
+        return crew.kickoff(inputs=inputs)
+
+    def kickoff_mission(
+        self,
+        inputs: Dict[str, Any],
+        run_id: Optional[str] = None,
+        on_stage: Optional[Callable[[MissionResult, str, str], None]] = None
+    ) -> MissionResult:
+        """
+        Run one mission isolated from any other run: own crew copy, own run ID and
+        own output folder (<runs_dir>/<run_id>/). Results are returned in memory;
+        failures are reported in the MissionResult instead of raised.
+
+        `on_stage(mission, task_name, raw_output)` is called as soon as each task
+        finishes (e.g. to stream the threat analysis before the SITREP is written).
+        """
+        run_id = run_id or new_run_id()
+        output_dir = os.path.join(self.mission_config.get('runs_dir', 'output/runs'), run_id)
+        mission = MissionResult(run_id, dict(inputs), output_dir)
+
+        started = time.monotonic()
+        stage_started = [started]
+
+        def mark(stage: str):
+            now = time.monotonic()
+            mission.timings[stage] = now - stage_started[0]
+            stage_started[0] = now
+
+        tasks_done = [0]
+
+        def on_task_done(task_output: Any):
+            # Tasks run sequentially, so completions arrive in MISSION_TASKS order
+            index = min(tasks_done[0], len(MISSION_TASKS) - 1)
+            tasks_done[0] += 1
+            mark(MISSION_TASKS[index])
+            mission.outputs[MISSION_TASKS[index]] = getattr(task_output, 'raw', str(task_output))
+            if on_stage is not None:
+                try:
+                    on_stage(mission, MISSION_TASKS[index], mission.outputs[MISSION_TASKS[index]])
+                except Exception as e:
+                    logger.warning(f"⚠️  Stage callback failed for {MISSION_TASKS[index]}: {e}")
+
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            self.crew_template()
+            mark('crew_setup')
+            kickoff_inputs = self.preprocess({**inputs, 'output_dir': output_dir})
+            mark('preprocessing')
+            result = self.kickoff(inputs=kickoff_inputs, task_callback=on_task_done)
+            mission.result = result
+            for name, task_output in zip(MISSION_TASKS, getattr(result, 'tasks_output', None) or []):
+                mission.outputs[name] = task_output.raw
+        except Exception as e:
+            logger.error(f"❌ Mission {run_id} failed: {e}")
+            mission.error = str(e)
+        mission.duration = time.monotonic() - started
+
+        logger.info(f"Mission {run_id} finished in {mission.duration:.1f}s -> {output_dir}")
+        return mission
+
+    def iter_missions(
+        self,
+        missions: List[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        ordered: bool = False
+    ) -> Iterator[MissionResult]:
+        """
+        Run several missions concurrently (at most `max_workers` at once, default
+        missions.max_concurrent) and yield a MissionResult as each one finishes,
+        or in input order with `ordered`. A mission dict may carry a `run_id` key
+        to choose its run ID.
+        """
+        if not missions:
+            return
+        max_workers = max_workers or int(self.mission_config.get('max_concurrent', 4))
+        # Build the template once up front instead of racing for it in the workers
+        self.crew_template()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="mission") as executor:
+            futures = []
+            for mission in missions:
+                inputs = dict(mission)
+                run_id = inputs.pop('run_id', None)
+                futures.append(executor.submit(self.kickoff_mission, inputs, run_id))
+            for future in (futures if ordered else as_completed(futures)):
+                yield future.result()
+
+    def kickoff_missions(
+        self, missions: List[Dict[str, Any]], max_workers: Optional[int] = None
+    ) -> List[MissionResult]:
+        """
+        Run several missions concurrently on a thread pool.
+        Returns one MissionResult per input, in input order.
+        """
+        return list(self.iter_missions(missions, max_workers, ordered=True))
+
+    async def akickoff_mission(self, inputs: Dict[str, Any], run_id: Optional[str] = None) -> MissionResult:
+        """Async variant of kickoff_mission (runs in the default thread pool)"""
+        return await asyncio.to_thread(self.kickoff_mission, inputs, run_id)
+
 
 def test_enhanced_llm_connectivity():
     """Enhanced test function to verify all LLM categories"""
@@ -237,21 +471,29 @@ def test_enhanced_llm_connectivity():
     logger.info("🧪 Testing Enhanced LLM connectivity...")
     
     try:
-        manager = LLMManager()
-        
-        # Test each category
+        manager = get_llm_manager(config.get('llm_manager', {}) or {})
+
+        # Lazy mode: make sure at least the default tier can be activated
+        if manager.lazy:
+            manager.get_best_model_for_task('default')
+
+        # Test each category against the shared status snapshot (no new probes)
+        snapshot = manager.get_status_snapshot()
         tests = [
-            ("Reasoning", manager.get_reasoning_model("A")),
-            ("Flash", manager.get_flash_model("A")),
-            ("Multimodal", manager.get_multimodal_model("A")),
-            ("Fallback", manager.get_fallback_model())
+            ("Reasoning", snapshot['categories']['reasoning']),
+            ("Flash", snapshot['categories']['flash']),
+            ("Multimodal", snapshot['categories']['multimodal']),
+            ("Fallback", [snapshot['fallback']])
         ]
         
         working_models = 0
-        for category, model in tests:
-            if model:
-                logger.info(f"✅ {category} model available: {model.model}")
+        for category, slots in tests:
+            working = [slot['model'] for slot in slots if slot['state'] == 'ok']
+            if working:
+                logger.info(f"✅ {category} model available: {working[0]}")
                 working_models += 1
+            elif manager.lazy and any(slot['state'] == 'pending' for slot in slots):
+                logger.info(f"⏸️  {category} models not probed yet (lazy)")
             else:
                 logger.warning(f"❌ No {category} model available")
         
@@ -1,5 +1,10 @@
 import sys
+import glob
+import signal
+import json
+import time
 import warnings
+import argparse
 import threading
 import os
 import logging
@@ -72,10 +77,16 @@ def setup_telemetry(enabled: bool):
 
 
 def setup_mqtt_consumer(enabled: bool, crew_instance):
-    """Initialize MQTT consumer if enabled."""
+    """
+    Initialize MQTT consumer if enabled.
+
+    Returns (thread, consumer), or (None, None). The consumer runs on a daemon
+    thread, so SIGTERM is handled here (main thread): it starts the consumer's
+    graceful drain instead of killing in-flight alerts.
+    """
     if not enabled:
         logger.info("MQTT consumer disabled")
-        return None
+        return None, None
     
     try:
         mqtt_path = Path(__file__).parent.parent / 'mqtt'
@@ -86,27 +97,29 @@ def setup_mqtt_consumer(enabled: bool, crew_instance):
         
         logger.info("Initializing MQTT consumer...")
         
-        def run_mqtt():
-            consumer = MQTTAgentConsumer(
-                topics=["Canal 1", "alerts"],
-                crew_instance=crew_instance
-            )
-            consumer.start()
+        consumer = MQTTAgentConsumer(
+            topics=["Canal 1", "alerts"],
+            crew_instance=crew_instance
+        )
         
-        mqtt_thread = threading.Thread(target=run_mqtt, daemon=True)
+        mqtt_thread = threading.Thread(target=consumer.start, daemon=True)
         mqtt_thread.start()
         
+        # Signal handlers can only be installed from the main thread
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: consumer.request_stop())
+        
         logger.info("MQTT consumer started - listening for tactical alerts")
-        return mqtt_thread
+        return mqtt_thread, consumer
         
     except ImportError as e:
         logger.error(f"MQTT consumer module not found: {e}")
         logger.warning("Make sure mqtt/ folder exists and dependencies are installed")
-        return None
+        return None, None
     except Exception as e:
         logger.error(f"Failed to start MQTT consumer: {e}")
         logger.warning("Continuing without MQTT consumer")
-        return None
+        return None, None
 
 
 def run(config):
@@ -156,15 +169,15 @@ def run(config):
         crew_instance = TacticalCrew()
         
         # Initialize MQTT consumer if enabled in config
-        mqtt_thread = None
+        mqtt_thread, mqtt_consumer = None, None
         if exec_config.get('enable_MQTT_consumer', False):
-            mqtt_thread = setup_mqtt_consumer(True, crew_instance)
+            mqtt_thread, mqtt_consumer = setup_mqtt_consumer(True, crew_instance)
         
         print("\nStep 3: Starting Mission Analysis...")
         print("=" * 60)
         
-        # Get the crew object and run the mission
-        result = crew_instance.crew().kickoff(inputs=inputs)
+        # Run the mission on a copy of the cached crew template
+        result = crew_instance.kickoff(inputs=inputs)
         
         print("\n" + "=" * 60)
         print("TACTICAL ANALYSIS MISSION COMPLETE")
@@ -181,19 +194,126 @@ def run(config):
             print("\nMQTT consumer continues running in background...")
             print("Press Ctrl+C to stop everything")
             
-            # Keep main thread alive if MQTT is running
+            # Keep main thread alive if MQTT is running (short joins so signals are handled)
             try:
-                mqtt_thread.join()
+                while mqtt_thread.is_alive():
+                    mqtt_thread.join(timeout=0.5)
             except KeyboardInterrupt:
                 print("\nStopping MQTT consumer...")
+                mqtt_consumer.stop()  # Drains queued alerts before disconnecting
     
     except Exception as e:
         logger.error(f"An error occurred while running the crew: {e}", exc_info=True)
         sys.exit(1)
 
 
+def collect_batch_inputs(source: str, location_input=None):
+    """
+    Build the mission list for a batch run.
+
+    `source` may be:
+      - a directory: every (non-hidden) file in it, recursively
+      - a glob pattern: e.g. "inputs/audio_inputs/*.mp3"
+      - a JSONL manifest: one mission per line, either a JSON string (the
+        mission_input) or an object with mission_input and optional
+        location_input / run_id
+    """
+    missions = []
+    if source.endswith('.jsonl') and os.path.isfile(source):
+        with open(source, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                if isinstance(entry, str):
+                    entry = {'mission_input': entry}
+                if 'mission_input' not in entry:
+                    raise ValueError(f"{source}:{line_number}: missing 'mission_input'")
+                entry.setdefault('location_input', location_input)
+                missions.append(entry)
+        return missions
+
+    if os.path.isdir(source):
+        root = Path(source)
+        paths = [str(p) for p in sorted(root.rglob('*'))
+                 if p.is_file() and not any(part.startswith('.') for part in p.relative_to(root).parts)]
+    else:
+        paths = sorted(p for p in glob.glob(source, recursive=True) if os.path.isfile(p))
+
+    for path in paths:
+        missions.append({'mission_input': path, 'location_input': location_input})
+    return missions
+
+
+def run_batch(config, source: str, workers=None, output_path: str = None, location_input=None):
+    """
+    Run every mission of a batch with bounded concurrency, streaming one JSONL
+    line per finished mission (run ID, status, per-stage timings, outputs) to
+    `output_path` (or stdout).
+    """
+    exec_config = config['execution']
+
+    missions = collect_batch_inputs(source, location_input)
+    if not missions:
+        logger.error(f"No inputs found for batch source: {source}")
+        sys.exit(1)
+
+    try:
+        from crew import TacticalCrew, test_enhanced_llm_connectivity
+    except ImportError as e:
+        logger.error(f"Failed to import TacticalCrew: {e}")
+        sys.exit(1)
+
+    if exec_config.get('execute_LLM_manager', True) and not test_enhanced_llm_connectivity():
+        print("LLM connectivity test failed!")
+        sys.exit(1)
+
+    crew_instance = TacticalCrew()
+    workers = workers or int(config.get('missions', {}).get('max_concurrent', 4))
+    print(f"\nBATCH: {len(missions)} missions from {source} ({workers} concurrent)")
+
+    out = open(output_path, 'a', encoding='utf-8') if output_path else sys.stdout
+    failed = 0
+    started = time.monotonic()
+    try:
+        for done, mission in enumerate(crew_instance.iter_missions(missions, max_workers=workers), 1):
+            if not mission.ok:
+                failed += 1
+            out.write(json.dumps(mission.to_dict(), ensure_ascii=False, default=str) + "\n")
+            out.flush()
+            logger.info(f"[{done}/{len(missions)}] {mission.run_id} "
+                        f"{'ok' if mission.ok else 'FAILED'} in {mission.duration:.1f}s")
+    finally:
+        if output_path:
+            out.close()
+
+    elapsed = time.monotonic() - started
+    print("\n" + "=" * 60)
+    print(f"BATCH COMPLETE: {len(missions) - failed}/{len(missions)} succeeded in {elapsed:.1f}s "
+          f"({len(missions) / elapsed * 60:.1f} missions/min)")
+    if output_path:
+        print(f"Results: {output_path}")
+    print("=" * 60)
+    return failed == 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tactical Analysis System - multimodal crew")
+    parser.add_argument('--batch', metavar='SOURCE',
+                        help="Directory, glob pattern or JSONL manifest of mission inputs")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Concurrent missions in batch mode (default: missions.max_concurrent)")
+    parser.add_argument('--output', metavar='FILE',
+                        help="Append batch results as JSONL to FILE (default: stdout)")
+    parser.add_argument('--location', default=None,
+                        help="location_input for every batch mission (default: auto-detect)")
+    return parser.parse_args(argv)
+
+
 def main():
     """Main entry point with comprehensive error handling"""
+    args = parse_args()
     
     print("=" * 70)
     print("TACTICAL ANALYSIS SYSTEM - MULTIMODAL CREW")
@@ -223,6 +343,9 @@ def main():
     setup_telemetry(exec_config.get('enable_telemetry', False))
     
     try:
+        if args.batch:
+            ok = run_batch(config, args.batch, args.workers, args.output, args.location)
+            sys.exit(0 if ok else 1)
         run(config)
     except KeyboardInterrupt:
         print("\n\nOperation cancelled by user")
@@ -1,20 +1,104 @@
 import os
+import time
 import logging
-from typing import Optional, Dict, List, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Optional, Dict, List, Tuple, Any
 from dotenv import load_dotenv
 from crewai import LLM
 
+from src.tactical.config.config_loader import load_execution_config
+from src.tactical.tools.llm_probe_cache import ProbeCache, fingerprint_api_key
+from src.tactical.tools.managed_llm import ManagedLLM
+from src.tactical.tools.llm_routing import ModelHealth, RoutedLLM
+from src.tactical.tools.llm_rate_limiter import ProviderRateLimiter
+from src.tactical.tools.llm_response_cache import ResponseCache
+from src.tactical.tools.local_fake_llm import LocalFakeLLM
+
 logger = logging.getLogger(__name__)
 
 class LLMManager:
     """Enhanced LLM Manager with expanded model categories and real connectivity testing"""
+
+    # Categories searched (in order) for each task type; unknown types use 'default'
+    TASK_CATEGORY_ORDER = {
+        'threat_analysis': ['reasoning'],
+        'report_generation': ['flash'],
+        'tactical_advisor': ['reasoning', 'multimodal'],
+        'multimodal': ['multimodal'],
+        'default': ['reasoning', 'flash'],
+    }
+
+    # Environment variable holding each provider's API key
+    PROVIDER_API_KEYS = {
+        'openai': "OPENAI_API_KEY",
+        'anthropic': "ANTHROPIC_API_KEY",
+        'google': "GOOGLE_API_KEY",
+        'deepseek': "DEEPSEEK_API_KEY",
+        'groq': "GROQ_API_KEY",
+        'mistral': "MISTRAL_API_KEY",
+    }
     
-    def __init__(self):
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            config: `llm_manager` section of execution_config.yaml (loaded if None)
+        """
+        if config is None:
+            config = load_execution_config().get('llm_manager', {}) or {}
+        self.config = config
+
+        # Deterministic offline provider ("local") for benchmarks and regression runs
+        self.local_fake_config = config.get('local_fake', {}) or {}
+        self.local_fake_enabled = bool(self.local_fake_config.get('enabled', False))
+
+        # Startup probing limits
+        self.probe_concurrency_per_provider = max(1, int(config.get('probe_concurrency_per_provider', 4)))
+        self.probe_max_workers = max(1, int(config.get('probe_max_workers', 16)))
+        self.probe_deadline_seconds = float(config.get('probe_deadline_seconds', 30))
+
+        # Live latency tracking, circuit breakers and routing
+        routing = config.get('routing', {}) or {}
+        self.latency_aware_routing = bool(routing.get('latency_aware', True))
+        self.health_settings = {
+            'ewma_alpha': float(routing.get('ewma_alpha', 0.3)),
+            'window': int(routing.get('latency_window', 100)),
+            'failure_threshold': int(routing.get('failure_threshold', 3)),
+            'cooldown_seconds': float(routing.get('cooldown_seconds', 60)),
+        }
+        self.health: Dict[Tuple[str, str], ModelHealth] = {}
+        self.hedging_config = config.get('hedging', {}) or {}
+
+        # Optional content-addressed cache of LLM responses
+        self.response_cache_config = config.get('response_cache', {}) or {}
+        self.response_cache = None
+        if self.response_cache_config.get('enabled', False):
+            self.response_cache = ResponseCache(
+                max_entries=int(self.response_cache_config.get('memory_max_entries', 256)),
+                disk_path=self.response_cache_config.get('disk_path', '.cache/llm_responses'),
+                disk_max_bytes=int(float(self.response_cache_config.get('disk_max_mb', 50)) * 1024 * 1024)
+            )
+
+        # Per-provider request/token budgets shared by every client of that provider
+        self.rate_limit_config = config.get('rate_limits', {}) or {}
+        self.rate_limiters: Dict[str, Optional[ProviderRateLimiter]] = {}
+
+        # Probe outcomes persisted across restarts
+        self.probe_cache = None
+        if config.get('probe_cache_enabled', True):
+            self.probe_cache = ProbeCache(
+                config.get('probe_cache_path', '.cache/llm_probe_cache.json'),
+                ttl_seconds=float(config.get('probe_cache_ttl_seconds', 3600))
+            )
+
         # Model categories - now supporting more than 3 models per category
         self.reasoning_models = {}  # A, B, C, D, E, F...
         self.flash_models = {}      # A, B, C, D, E...
         self.multimodal_models = {} # A, B, C, D, E...
         self.fallback_model = None
+
+        # One shared client per (model, provider) endpoint; None = probe failed
+        self.llm_registry: Dict[Tuple[str, str], Optional[ManagedLLM]] = {}
         
         # Track attempted configurations for better error reporting
         self.attempted_configs = {
@@ -24,21 +108,41 @@ class LLMManager:
             'fallback': []
         }
         
+        self.model_dicts = {
+            'reasoning': self.reasoning_models,
+            'flash': self.flash_models,
+            'multimodal': self.multimodal_models,
+        }
+        self.category_configs = self._get_category_configs()
+        self.probed_slots = set()     # (category, letter) slots that have been resolved
+        self.task_selections = {}     # task_type -> selected model
+        self._selections_in_flight: Dict[str, threading.Event] = {}  # task_type -> done event
+        self._lock = threading.RLock()
+
+        # "eager" probes every slot now; "lazy" probes a tier on first use
+        self.lazy = str(config.get('probe_mode', 'eager')).lower() == 'lazy'
+
         # Track which models are available
         self.available_providers = self._check_available_providers()
-        self._setup_categorized_llms()
+        self._record_attempted_configs()
+        if not self.lazy:
+            self._setup_categorized_llms()
+        else:
+            logger.info("💤 Lazy LLM activation - tiers are probed on first use")
     
     def _check_available_providers(self) -> Dict[str, bool]:
         """Check which API providers are available"""
         providers = {
-            'openai': bool(os.getenv("OPENAI_API_KEY", "").strip()),
-            'anthropic': bool(os.getenv("ANTHROPIC_API_KEY", "").strip()),
-            'google': bool(os.getenv("GOOGLE_API_KEY", "").strip()),
-            'deepseek': bool(os.getenv("DEEPSEEK_API_KEY", "").strip()),
-            'groq': bool(os.getenv("GROQ_API_KEY", "").strip()),
-            'mistral': bool(os.getenv("MISTRAL_API_KEY", "").strip())
+            provider: bool(os.getenv(env_var, "").strip())
+            for provider, env_var in self.PROVIDER_API_KEYS.items()
         }
         
+        if self.local_fake_enabled:
+            providers['local'] = True
+            if self.local_fake_config.get('exclusive', True):
+                # Offline run: never touch cloud providers even if keys are set
+                providers = {provider: provider == 'local' for provider in providers}
+        
         for provider, available in providers.items():
             if available:
                 logger.info(f"✅ {provider.title()} API key found")
@@ -62,45 +166,55 @@ class LLMManager:
             logger.warning(f"❌ {model_name} - Real API test FAILED: {str(e)[:100]}...")
             return False
     
+    def _create_llm(self, model: str, provider: str = None) -> LLM:
+        """Create LLM instance with provider-specific settings (no API call)"""
+        if provider == 'local':
+            # Local fake model - no network, deterministic responses
+            settings = {k: v for k, v in self.local_fake_config.items()
+                        if k not in ('enabled', 'exclusive')}
+            llm = LocalFakeLLM(model=model, **settings)
+        elif provider == 'groq':
+            # Groq uses different API base
+            llm = LLM(
+                model=model,
+                api_base="https://api.groq.com/openai/v1",
+                drop_params=True,
+                additional_drop_params=["stop"]
+            )
+        elif provider == 'google':
+            # For Google Gemini models
+            llm = LLM(
+                model=model,
+                drop_params=True,
+                additional_drop_params=["stop"]
+            )
+        elif provider == 'mistral':
+            # For Mistral models
+            llm = LLM(
+                model=model,
+                drop_params=True,
+                additional_drop_params=["stop"]
+            )
+        elif provider == 'deepseek':
+            # For DeepSeek models
+            llm = LLM(
+                model=model,
+                drop_params=True,
+                additional_drop_params=["stop"]
+            )
+        else:
+            llm = LLM(
+                model=model,
+                drop_params=True,
+                additional_drop_params=["stop"]
+            )
+        return llm
+
     def _create_and_test_llm(self, model: str, provider: str = None) -> Optional[LLM]:
         """Create LLM instance with error handling AND real testing"""
         try:
-            if provider == 'groq':
-                # Groq uses different API base
-                llm = LLM(
-                    model=model,
-                    api_base="https://api.groq.com/openai/v1",
-                    drop_params=True,
-                    additional_drop_params=["stop"]
-                )
-            elif provider == 'google':
-                # For Google Gemini models
-                llm = LLM(
-                    model=model,
-                    drop_params=True,
-                    additional_drop_params=["stop"]
-                )
-            elif provider == 'mistral':
-                # For Mistral models
-                llm = LLM(
-                    model=model,
-                    drop_params=True,
-                    additional_drop_params=["stop"]
-                )
-            elif provider == 'deepseek':
-                # For DeepSeek models
-                llm = LLM(
-                    model=model,
-                    drop_params=True,
-                    additional_drop_params=["stop"]
-                )
-            else:
-                llm = LLM(
-                    model=model,
-                    drop_params=True,
-                    additional_drop_params=["stop"]
-                )
-            
+            llm = self._create_llm(model, provider)
+
             # Now actually TEST the model with a real API call
             if self._test_llm_with_simple_call(llm, model):
                 logger.info(f"✅ {model} configured and tested successfully")
@@ -113,103 +227,307 @@ class LLMManager:
             logger.error(f"❌ Failed to setup {model}: {e}")
             return None
     
-    def _setup_categorized_llms(self):
-        """Setup LLMs by category with expanded model support"""
-        
-        # REASONING MODELS - Expanded list for complex analysis
-        reasoning_configs = [
-            # Tier 1: Premium reasoning models
-            ("gpt-4-turbo", "openai"),
-            ("claude-3-5-sonnet-20241022", "anthropic"),
-            ("gemini-2.0-flash-exp", "google"),  # Gemini 2.0 Flash Experimental for reasoning
-            
-            # Tier 2: Strong reasoning alternatives
-            ("gpt-4", "openai"),
-            ("mistral-large-2411", "mistral"),  # Mistral Large
-            ("deepseek-r1-distill-llama-70b", "deepseek"),  # DeepSeek R1 Distill
-            
-            # Tier 3: Additional reasoning options
-            ("qwen/qwen-2.5-72b-instruct", "groq"),  # Qwen 3 32B via Groq (actual model name)
-            ("llama-3.3-70b-versatile", "groq"),  # Llama as reasoning fallback
-        ]
-        
-        for i, (model, provider) in enumerate(reasoning_configs):
-            letter = chr(65+i)  # A, B, C, D, E, F, G, H
-            if self.available_providers.get(provider, False):
-                self.attempted_configs['reasoning'][letter] = model
-                llm = self._create_and_test_llm(model, provider)
-                if llm:
-                    self.reasoning_models[f"reasoning_{letter}"] = llm
-            else:
-                self.attempted_configs['reasoning'][letter] = f"{model} (no {provider} key)"
-        
-        # FLASH MODELS - Expanded for fast responses
-        flash_configs = [
-            # Tier 1: Fastest models
-            ("llama-3.3-70b-versatile", "groq"),
-            ("llama-3.1-8b-instant", "groq"),
-            ("gemini-2.0-flash-exp", "google"),  # Gemini 2.0 Flash
-            
-            # Tier 2: Fast alternatives
-            ("gpt-4o-mini", "openai"),
-            ("gpt-3.5-turbo", "openai"),
-            ("claude-3-haiku-20240307", "anthropic"),
-            
-            # Tier 3: Additional fast options
-            ("mistral-small-2409", "mistral"),  # Mistral Small for fast responses
-        ]
-        
-        for i, (model, provider) in enumerate(flash_configs):
-            letter = chr(65+i)  # A, B, C, D, E, F, G
-            if self.available_providers.get(provider, False):
-                self.attempted_configs['flash'][letter] = model
-                llm = self._create_and_test_llm(model, provider)
-                if llm:
-                    self.flash_models[f"flash_{letter}"] = llm
-            else:
-                self.attempted_configs['flash'][letter] = f"{model} (no {provider} key)"
-        
-        # MULTIMODAL MODELS - Expanded for vision and complex input
-        multimodal_configs = [
-            # Tier 1: Best multimodal
-            ("gpt-4o", "openai"),
-            ("gemini-2.0-flash-exp", "google"),  # Gemini 2.0 for multimodal
-            ("gpt-4-turbo", "openai"),
-            
-            # Tier 2: Alternative multimodal
-            ("gpt-4", "openai"),
-            ("claude-3-5-sonnet-20241022", "anthropic"),  # Claude for text analysis
-            
-            # Tier 3: Fallback multimodal
-            ("gpt-4o-mini", "openai"),
-        ]
-        
-        for i, (model, provider) in enumerate(multimodal_configs):
-            letter = chr(65+i)  # A, B, C, D, E, F
-            if self.available_providers.get(provider, False):
-                self.attempted_configs['multimodal'][letter] = model
-                llm = self._create_and_test_llm(model, provider)
-                if llm:
-                    self.multimodal_models[f"multimodal_{letter}"] = llm
+    def _key_fingerprint(self, provider: str) -> str:
+        """Fingerprint of the provider's current API key (cache entries are tied to it)"""
+        return fingerprint_api_key(os.getenv(self.PROVIDER_API_KEYS.get(provider, ""), ""))
+
+    def _wrap_llm(
+        self, llm: Optional[LLM], provider: str, probe_latency: Optional[float] = None
+    ) -> Optional[ManagedLLM]:
+        """Wrap a working client so live latency and failures are reported back to the manager"""
+        if llm is None:
+            return None
+        health = self.health.setdefault((llm.model, provider), ModelHealth(**self.health_settings))
+        if probe_latency is not None:
+            health.seed_latency(probe_latency)
+        return ManagedLLM(
+            llm, provider,
+            on_failure=self._handle_runtime_failure,
+            health=health,
+            rate_limiter=self._get_rate_limiter(provider)
+        )
+
+    def _get_rate_limiter(self, provider: str) -> Optional[ProviderRateLimiter]:
+        """Shared limiter for a provider: `default` settings overridden by the provider's own"""
+        if provider not in self.rate_limiters:
+            settings = dict(self.rate_limit_config.get('default', {}) or {})
+            settings.update(self.rate_limit_config.get(provider, {}) or {})
+            limits = {
+                key: settings.get(key)
+                for key in ('requests_per_minute', 'tokens_per_minute', 'max_in_flight')
+            }
+            self.rate_limiters[provider] = (
+                ProviderRateLimiter(provider, **limits) if any(limits.values()) else None
+            )
+        return self.rate_limiters[provider]
+
+    def _handle_runtime_failure(self, model: str, provider: str, error: Exception):
+        """A live call failed: force a real re-probe of this endpoint on the next start"""
+        logger.warning(f"⚠️  {model} failed at runtime: {str(error)[:100]}")
+        if self.probe_cache:
+            self.probe_cache.invalidate(model, provider)
+
+    def _probe_endpoint(self, model: str, provider: str) -> Tuple[Optional[LLM], float]:
+        """Create and test one endpoint, recording the outcome in the probe cache"""
+        started = time.monotonic()
+        llm = self._create_and_test_llm(model, provider)
+        latency = time.monotonic() - started
+        if self.probe_cache:
+            self.probe_cache.record(
+                model, provider,
+                ok=llm is not None,
+                latency=latency,
+                key_fingerprint=self._key_fingerprint(provider)
+            )
+        return llm, latency
+
+    def _resolve_from_cache(self, model: str, provider: str) -> Tuple[bool, Optional[LLM], Optional[float]]:
+        """
+        Reuse a fresh cached probe outcome if there is one.
+
+        Returns (hit, llm, latency): on a hit, llm is a ready client for a cached
+        success or None for a cached failure; on a miss the endpoint must be probed.
+        """
+        if not self.probe_cache:
+            return False, None, None
+        entry = self.probe_cache.get(model, provider, self._key_fingerprint(provider))
+        if entry is None:
+            return False, None, None
+        if not entry.get('ok'):
+            logger.info(f"💾 {model} - cached probe FAILED, skipping")
+            return True, None, None
+        try:
+            llm = self._create_llm(model, provider)
+        except Exception as e:
+            logger.error(f"❌ Failed to setup {model}: {e}")
+            return True, None, None
+        logger.info(f"💾 {model} - cached probe PASSED ({entry.get('latency', 0):.2f}s)")
+        return True, llm, entry.get('latency')
+
+    def _get_category_configs(self) -> Dict[str, List[Tuple[str, str]]]:
+        """(model, provider) candidates per category, in preference order"""
+        configs = self._get_cloud_category_configs()
+        if self.local_fake_enabled:
+            # The local fake model joins every tier as its last option
+            for category, candidates in configs.items():
+                candidates.append((f"local/fake-{category}", "local"))
+        return configs
+
+    def _get_cloud_category_configs(self) -> Dict[str, List[Tuple[str, str]]]:
+        """Cloud (model, provider) candidates per category, in preference order"""
+        return {
+            # REASONING MODELS - Expanded list for complex analysis
+            'reasoning': [
+                # Tier 1: Premium reasoning models
+                ("gpt-4-turbo", "openai"),
+                ("claude-3-5-sonnet-20241022", "anthropic"),
+                ("gemini-2.0-flash-exp", "google"),  # Gemini 2.0 Flash Experimental for reasoning
+
+                # Tier 2: Strong reasoning alternatives
+                ("gpt-4", "openai"),
+                ("mistral-large-2411", "mistral"),  # Mistral Large
+                ("deepseek-r1-distill-llama-70b", "deepseek"),  # DeepSeek R1 Distill
+
+                # Tier 3: Additional reasoning options
+                ("qwen/qwen-2.5-72b-instruct", "groq"),  # Qwen 3 32B via Groq (actual model name)
+                ("llama-3.3-70b-versatile", "groq"),  # Llama as reasoning fallback
+            ],
+
+            # FLASH MODELS - Expanded for fast responses
+            'flash': [
+                # Tier 1: Fastest models
+                ("llama-3.3-70b-versatile", "groq"),
+                ("llama-3.1-8b-instant", "groq"),
+                ("gemini-2.0-flash-exp", "google"),  # Gemini 2.0 Flash
+
+                # Tier 2: Fast alternatives
+                ("gpt-4o-mini", "openai"),
+                ("gpt-3.5-turbo", "openai"),
+                ("claude-3-haiku-20240307", "anthropic"),
+
+                # Tier 3: Additional fast options
+                ("mistral-small-2409", "mistral"),  # Mistral Small for fast responses
+            ],
+
+            # MULTIMODAL MODELS - Expanded for vision and complex input
+            'multimodal': [
+                # Tier 1: Best multimodal
+                ("gpt-4o", "openai"),
+                ("gemini-2.0-flash-exp", "google"),  # Gemini 2.0 for multimodal
+                ("gpt-4-turbo", "openai"),
+
+                # Tier 2: Alternative multimodal
+                ("gpt-4", "openai"),
+                ("claude-3-5-sonnet-20241022", "anthropic"),  # Claude for text analysis
+
+                # Tier 3: Fallback multimodal
+                ("gpt-4o-mini", "openai"),
+            ],
+
+            # FALLBACK MODEL - Most reliable options
+            'fallback': [
+                ("gpt-3.5-turbo", "openai"),
+                ("claude-3-haiku-20240307", "anthropic"),
+                ("llama-3.1-8b-instant", "groq"),
+                ("mistral-small-2409", "mistral"),
+            ],
+        }
+
+    def _probe_concurrently(self, jobs: List[Tuple[str, str]]) -> List[Tuple[Optional[LLM], Optional[float]]]:
+        """
+        Run _create_and_test_llm for every (model, provider) job on a thread pool.
+
+        At most `probe_concurrency_per_provider` probes hit the same provider at
+        once, and every probe shares one global deadline: anything still running
+        (or still waiting for its provider slot) when it expires counts as failed.
+        Results are (llm, probe latency) pairs in the same order as `jobs`.
+        """
+        if not jobs:
+            return []
+
+        deadline = time.monotonic() + self.probe_deadline_seconds
+        provider_slots = {
+            provider: threading.BoundedSemaphore(self.probe_concurrency_per_provider)
+            for _, provider in jobs
+        }
+
+        def probe(model: str, provider: str) -> Tuple[Optional[LLM], Optional[float]]:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not provider_slots[provider].acquire(timeout=remaining):
+                return None, None
+            try:
+                return self._probe_endpoint(model, provider)
+            finally:
+                provider_slots[provider].release()
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.probe_max_workers, len(jobs)),
+            thread_name_prefix="llm-probe"
+        )
+        futures = [executor.submit(probe, model, provider) for model, provider in jobs]
+        done, _ = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+        # Don't block boot on stragglers - they finish in the background and are ignored
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        results = []
+        for (model, provider), future in zip(jobs, futures):
+            if future in done:
+                results.append(future.result())
             else:
-                self.attempted_configs['multimodal'][letter] = f"{model} (no {provider} key)"
-        
-        # FALLBACK MODEL - Most reliable options
-        fallback_configs = [
-            ("gpt-3.5-turbo", "openai"),
-            ("claude-3-haiku-20240307", "anthropic"), 
-            ("llama-3.1-8b-instant", "groq"),
-            ("mistral-small-2409", "mistral"),
+                logger.warning(
+                    f"⏱️  {model} - probe exceeded {self.probe_deadline_seconds}s startup deadline"
+                )
+                results.append((None, None))
+        return results
+
+    def _resolve_endpoints(self, jobs: List[Tuple[str, str]]):
+        """
+        Make sure every (model, provider) job has a registry entry.
+
+        The same endpoint appears in several tiers, so each one is probed only
+        once, and the API call is skipped entirely when a fresh cached outcome exists.
+        """
+        to_probe = []
+        with self._lock:
+            for model, provider in dict.fromkeys(jobs):
+                if (model, provider) in self.llm_registry:
+                    continue
+                hit, llm, latency = self._resolve_from_cache(model, provider)
+                if hit:
+                    self.llm_registry[(model, provider)] = self._wrap_llm(llm, provider, latency)
+                else:
+                    to_probe.append((model, provider))
+
+        if not to_probe:
+            return
+        # The API calls run without the lock so status snapshots never wait on the network
+        started = time.monotonic()
+        results = self._probe_concurrently(to_probe)
+        with self._lock:
+            for (model, provider), (llm, latency) in zip(to_probe, results):
+                if (model, provider) not in self.llm_registry:  # another task type may have probed it meanwhile
+                    self.llm_registry[(model, provider)] = self._wrap_llm(llm, provider, latency)
+        logger.info(f"🧪 Probed {len(to_probe)} LLM endpoints in {time.monotonic() - started:.1f}s")
+        if self.probe_cache:
+            self.probe_cache.save()
+
+    def _assign_slot(self, category: str, letter: str):
+        """Copy the registry outcome of a probed slot into its category"""
+        model, provider = self.category_configs[category][ord(letter) - 65]
+        self.probed_slots.add((category, letter))
+        llm = self.llm_registry.get((model, provider))
+        if not llm:
+            return
+        if category == 'fallback':
+            # First working model in preference order wins
+            if self.fallback_model is None:
+                self.fallback_model = llm
+        else:
+            self.model_dicts[category][f"{category}_{letter}"] = llm
+
+    def _record_attempted_configs(self):
+        """Fill attempted_configs for status reporting (no API calls)"""
+        for category, configs in self.category_configs.items():
+            for i, (model, provider) in enumerate(configs):
+                letter = chr(65+i)  # A, B, C, D, E, F, G, H
+                if category == 'fallback':
+                    self.attempted_configs['fallback'].append(model)
+                elif self.available_providers.get(provider, False):
+                    self.attempted_configs[category][letter] = model
+                else:
+                    self.attempted_configs[category][letter] = f"{model} (no {provider} key)"
+
+    def _setup_categorized_llms(self):
+        """Setup LLMs by category with expanded model support (probes run concurrently)"""
+        # One probe job per configured slot whose provider has a key
+        slots = [
+            (category, chr(65+i), (model, provider))
+            for category, configs in self.category_configs.items()
+            for i, (model, provider) in enumerate(configs)
+            if self.available_providers.get(provider, False)
         ]
-        
-        for model, provider in fallback_configs:
-            self.attempted_configs['fallback'].append(model)
-            if self.available_providers.get(provider, False):
-                llm = self._create_and_test_llm(model, provider)
-                if llm:
-                    self.fallback_model = llm
+        self._resolve_endpoints([job for _, _, job in slots])
+
+        # Assign results in category order so preferences are unchanged
+        for category, letter, _ in slots:
+            self._assign_slot(category, letter)
+
+    def _activate_slot(self, category: str, letter: str) -> Optional[LLM]:
+        """
+        Lazy mode: probe a single slot on first use and return its model (or None).
+        Must be called without holding the lock: it is only taken to read and record state.
+        """
+        model, provider = self.category_configs[category][ord(letter) - 65]
+        with self._lock:
+            probed = (category, letter) in self.probed_slots
+        if not probed:
+            if not self.available_providers.get(provider, False):
+                return None
+            self._resolve_endpoints([(model, provider)])
+        with self._lock:
+            if not probed:
+                self._assign_slot(category, letter)
+            if category == 'fallback':
+                return self.fallback_model
+            return self.model_dicts[category].get(f"{category}_{letter}")
+
+    def _find_fallback_model(self) -> Optional[LLM]:
+        """Return the fallback model, probing candidates in order when running lazily"""
+        if self.lazy and self.fallback_model is None:
+            for i in range(len(self.category_configs['fallback'])):
+                if self._activate_slot('fallback', chr(65+i)):
                     break
+        return self.fallback_model
     
+    def _is_pending(self, category: str, letter: str) -> bool:
+        """Lazy mode: the slot has an API key but has not been probed yet"""
+        _, provider = self.category_configs[category][ord(letter) - 65]
+        return (
+            self.lazy
+            and self.available_providers.get(provider, False)
+            and (category, letter) not in self.probed_slots
+        )
+
     def get_reasoning_model(self, preference: str = "A") -> Optional[LLM]:
         """Get reasoning model by preference (A, B, C, D, E, F, G, H)"""
         return self.reasoning_models.get(f"reasoning_{preference}")
@@ -227,61 +545,89 @@ class LLMManager:
         return self.fallback_model
     
     def get_best_model_for_task(self, task_type: str) -> LLM:
-        """Get the best WORKING model for a specific task type"""
-        
-        if task_type == "threat_analysis":
-            # Try reasoning models in order
-            for letter in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']:
-                model = self.get_reasoning_model(letter)
-                if model:
-                    return model
-            return self.get_fallback_model()
-        
-        elif task_type == "report_generation":
-            # Try flash models in order
-            for letter in ['A', 'B', 'C', 'D', 'E', 'F', 'G']:
-                model = self.get_flash_model(letter)
-                if model:
-                    return model
-            return self.get_fallback_model()
-        
-        elif task_type == "tactical_advisor":
-            # Try reasoning first, then multimodal
-            for letter in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']:
-                model = self.get_reasoning_model(letter)
-                if model:
-                    return model
-            for letter in ['A', 'B', 'C', 'D', 'E', 'F']:
-                model = self.get_multimodal_model(letter)
-                if model:
-                    return model
-            return self.get_fallback_model()
-        
-        elif task_type == "multimodal":
-            # Try multimodal models in order
-            for letter in ['A', 'B', 'C', 'D', 'E', 'F']:
-                model = self.get_multimodal_model(letter)
-                if model:
-                    return model
-            return self.get_fallback_model()
-        
-        else:
-            # Default: try reasoning first, then flash, then fallback
-            for letter in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']:
-                model = self.get_reasoning_model(letter)
-                if model:
-                    return model
-            for letter in ['A', 'B', 'C', 'D', 'E', 'F', 'G']:
-                model = self.get_flash_model(letter)
-                if model:
-                    return model
-            return self.get_fallback_model()
-        
-        if not self.get_fallback_model():
-            raise RuntimeError("No working LLM models available for any task!")
-        
-        logger.info(f"🎯 Selected {self.get_fallback_model().model} for {task_type}")
-        return self.get_fallback_model()
+        """
+        Get the best WORKING model for a specific task type.
+
+        Categories listed in TASK_CATEGORY_ORDER are searched A, B, C... and the
+        fallback model is the last resort. The result is a RoutedLLM over every
+        working candidate, which picks the fastest healthy model on each call and
+        fails over past open circuits. In lazy mode candidates are probed only
+        here, stopping at the first one that works; the choice is remembered.
+        Probes run outside the lock, and concurrent callers asking for the same
+        task type wait for the one selection in flight instead of probing again.
+        """
+        while True:
+            with self._lock:
+                if task_type in self.task_selections:
+                    return self.task_selections[task_type]
+                in_flight = self._selections_in_flight.get(task_type)
+                if in_flight is None:
+                    in_flight = self._selections_in_flight[task_type] = threading.Event()
+                    break
+            in_flight.wait()  # None selected: the loop re-checks and tries again
+
+        try:
+            selected = self._select_model_for_task(task_type)
+            if selected:
+                with self._lock:
+                    self.task_selections[task_type] = selected
+            return selected
+        finally:
+            with self._lock:
+                del self._selections_in_flight[task_type]
+            in_flight.set()
+
+    def _select_model_for_task(self, task_type: str) -> Optional[LLM]:
+        """Build the RoutedLLM for a task type (lazy probes happen here, without the lock)"""
+        categories = self.TASK_CATEGORY_ORDER.get(task_type, self.TASK_CATEGORY_ORDER['default'])
+        tiers = []
+        seen = set()  # the same client can sit in several categories
+        for category in categories:
+            tier = []
+            for i in range(len(self.category_configs[category])):
+                letter = chr(65+i)
+                if self.lazy:
+                    llm = self._activate_slot(category, letter)
+                else:
+                    llm = self.model_dicts[category].get(f"{category}_{letter}")
+                if llm and id(llm) not in seen:
+                    seen.add(id(llm))
+                    tier.append(llm)
+                    if self.lazy:
+                        break
+            if tier:
+                tiers.append(tier)
+                if self.lazy:
+                    break
+
+        # Fallback is the last resort (lazy mode only probes it if nothing else works)
+        fallback = self.fallback_model if tiers else self._find_fallback_model()
+        if fallback and id(fallback) not in seen:
+            tiers.append([fallback])
+
+        if not tiers:
+            logger.error(f"❌ No working LLM models available for {task_type}")
+            return None
+
+        hedging = self.hedging_config.get(task_type) or None
+        if hedging and not hedging.get('enabled', True):
+            hedging = None
+        # Response cache unless this task type bypasses it
+        response_cache = self.response_cache
+        if task_type in (self.response_cache_config.get('bypass_tasks') or []):
+            response_cache = None
+        ttls = self.response_cache_config.get('ttl_seconds', {}) or {}
+        cache_ttl = float(ttls.get(task_type, ttls.get('default', 3600)))
+
+        selected = RoutedLLM(
+            task_type, tiers,
+            latency_aware=self.latency_aware_routing,
+            hedging=hedging,
+            response_cache=response_cache,
+            cache_ttl=cache_ttl
+        )
+        logger.info(f"🎯 Selected {[llm.model for tier in tiers for llm in tier]} for {task_type}")
+        return selected
     
     def get_available_models_count(self) -> Dict[str, int]:
         """Get count of available models by category"""
@@ -292,97 +638,200 @@ class LLMManager:
             'fallback': 1 if self.fallback_model else 0
         }
     
-    def print_enhanced_status(self):
-        """Print detailed status of all model categories with expanded listing"""
-        print("\n" + "="*70)
-        print("🤖 LLM CONFIGURATION STATUS (EXPANDED MODELS)")
-        print("="*70)
-
-        # Reasoning Models - expanded list
-        print("\n Reasoning models :: Tactical analysis & strategy")
-        reasoning_letters = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
-        for letter in reasoning_letters:
-            key = f"reasoning_{letter}"
-            model_name = f"Reasoning Model {letter}"
-            llm = self.reasoning_models.get(key)
-            attempted_model = self.attempted_configs['reasoning'].get(letter, "")
-            
-            if llm:
-                status = f"✅ {llm.model}"
-            elif attempted_model:
-                status = f"❌ {attempted_model} not configured"
-            else:
-                continue  # Skip if no attempt was made
-            print(f"  {model_name:<20} {status}")
-
-        # Flash Models - expanded list  
-        print("\n Flash models :: Fast responses & editing")
-        flash_letters = ['A', 'B', 'C', 'D', 'E', 'F', 'G']
-        for letter in flash_letters:
-            key = f"flash_{letter}"
-            model_name = f"Flash Model {letter}"
-            llm = self.flash_models.get(key)
-            attempted_model = self.attempted_configs['flash'].get(letter, "")
-            
-            if llm:
-                status = f"✅ {llm.model}"
-            elif attempted_model:
-                status = f"❌ {attempted_model} not configured"
-            else:
-                continue
-            print(f"  {model_name:<20} {status}")
-
-        # Multimodal Models - expanded list
-        print("\n Multimodal models :: Vision & complex input")
-        multimodal_letters = ['A', 'B', 'C', 'D', 'E', 'F']
-        for letter in multimodal_letters:
-            key = f"multimodal_{letter}"
-            model_name = f"Multimodal Model {letter}"
-            llm = self.multimodal_models.get(key)
-            attempted_model = self.attempted_configs['multimodal'].get(letter, "")
-            
-            if llm:
-                status = f"✅ {llm.model}"
-            elif attempted_model:
-                status = f"❌ {attempted_model} not configured"
-            else:
-                continue
-            print(f"  {model_name:<20} {status}")
-        
+    def get_status_snapshot(self) -> Dict[str, Any]:
+        """
+        Thread-safe, point-in-time copy of the manager state for status displays.
+
+        Reading the snapshot never probes a provider, so the CLI, the Gradio
+        status panel and main.run can all call it as often as they like.
+        """
+        with self._lock:
+            categories = {}
+            for category in ('reasoning', 'flash', 'multimodal'):
+                slots = []
+                for i in range(len(self.category_configs[category])):
+                    letter = chr(65+i)
+                    llm = self.model_dicts[category].get(f"{category}_{letter}")
+                    attempted = self.attempted_configs[category].get(letter, "")
+                    if llm:
+                        state = 'ok'
+                    elif self._is_pending(category, letter):
+                        state = 'pending'
+                    else:
+                        state = 'failed'
+                    slots.append({
+                        'letter': letter,
+                        'state': state,
+                        'model': llm.model if llm else attempted,
+                    })
+                categories[category] = slots
+
+            fallback_pending = self.lazy and not any(
+                category == 'fallback' for category, _ in self.probed_slots
+            )
+            return {
+                'timestamp': time.time(),
+                'mode': 'lazy' if self.lazy else 'eager',
+                'categories': categories,
+                'fallback': {
+                    'state': 'ok' if self.fallback_model else ('pending' if fallback_pending else 'failed'),
+                    'model': self.fallback_model.model if self.fallback_model else None,
+                    'attempted': list(self.attempted_configs['fallback']),
+                },
+                'counts': self.get_available_models_count(),
+                'available_providers': dict(self.available_providers),
+                'task_selections': {task: llm.model for task, llm in self.task_selections.items()},
+                'health': {
+                    f"{model} ({provider})": health.snapshot()
+                    for (model, provider), health in self.health.items()
+                },
+                'hedging': {
+                    task: llm.hedge_stats.snapshot()
+                    for task, llm in self.task_selections.items() if llm.hedging
+                },
+                'response_cache': self.response_cache.snapshot() if self.response_cache else None,
+                'rate_limits': {
+                    provider: limiter.snapshot()
+                    for provider, limiter in self.rate_limiters.items() if limiter
+                },
+            }
+
+    def format_enhanced_status(self, snapshot: Optional[Dict[str, Any]] = None) -> str:
+        """Render a status snapshot as the detailed category listing"""
+        snapshot = snapshot or self.get_status_snapshot()
+        lines = []
+        lines.append("\n" + "="*70)
+        lines.append("🤖 LLM CONFIGURATION STATUS (EXPANDED MODELS)")
+        lines.append("="*70)
+
+        headers = {
+            'reasoning': ("\n Reasoning models :: Tactical analysis & strategy", "Reasoning Model"),
+            'flash': ("\n Flash models :: Fast responses & editing", "Flash Model"),
+            'multimodal': ("\n Multimodal models :: Vision & complex input", "Multimodal Model"),
+        }
+        for category, (header, label) in headers.items():
+            lines.append(header)
+            for slot in snapshot['categories'][category]:
+                if slot['state'] == 'ok':
+                    status = f"✅ {slot['model']}"
+                elif not slot['model']:
+                    continue  # Skip if no attempt was made
+                elif slot['state'] == 'pending':
+                    status = f"⏸️  {slot['model']} not probed yet (lazy)"
+                else:
+                    status = f"❌ {slot['model']} not configured"
+                model_name = f"{label} {slot['letter']}"
+                lines.append(f"  {model_name:<20} {status}")
+
         # Fallback Model
-        print("\n  Fallback model :: Emergency backup")
-        if self.fallback_model:
-            fallback_status = f"✅ {self.fallback_model.model}"
+        lines.append("\n  Fallback model :: Emergency backup")
+        fallback = snapshot['fallback']
+        if fallback['state'] == 'ok':
+            fallback_status = f"✅ {fallback['model']}"
+        elif fallback['state'] == 'pending':
+            fallback_status = "⏸️  not probed yet (lazy)"
         else:
-            attempted_models = ", ".join(self.attempted_configs['fallback'][:3])  # Show first 3
+            attempted_models = ", ".join(fallback['attempted'][:3])  # Show first 3
             fallback_status = f"❌ {attempted_models}... not configured"
-        print(f"  Fallback Model      {fallback_status}")
-        
+        lines.append(f"  Fallback Model      {fallback_status}")
+
         # Summary
-        counts = self.get_available_models_count()
+        counts = snapshot['counts']
         total_models = sum(counts.values())
-        
-        print(f"\n📊 SUMMARY")
-        print(f"  Total WORKING Models: {total_models}")
-        print(f"  Reasoning: {counts['reasoning']}/{len(reasoning_letters)}")
-        print(f"  Flash: {counts['flash']}/{len(flash_letters)}")
-        print(f"  Multimodal: {counts['multimodal']}/{len(multimodal_letters)}") 
-        print(f"  Fallback: {counts['fallback']}/1")
+        categories = snapshot['categories']
+        providers = snapshot['available_providers']
+
+        lines.append(f"\n📊 SUMMARY")
+        lines.append(f"  Total WORKING Models: {total_models}")
+        lines.append(f"  Reasoning: {counts['reasoning']}/{len(categories['reasoning'])}")
+        lines.append(f"  Flash: {counts['flash']}/{len(categories['flash'])}")
+        lines.append(f"  Multimodal: {counts['multimodal']}/{len(categories['multimodal'])}")
+        lines.append(f"  Fallback: {counts['fallback']}/1")
+        if snapshot['mode'] == 'lazy':
+            lines.append("  Mode: lazy (tiers are probed on first use)")
+
+        # Live routing statistics (only once real calls have been made)
+        live = {name: h for name, h in snapshot.get('health', {}).items() if h['calls']}
+        if live:
+            lines.append(f"\n⚡ LIVE ROUTING")
+            for name, h in sorted(live.items(), key=lambda item: item[1]['ewma_latency'] or 0):
+                ewma = f"{h['ewma_latency']:.2f}s" if h['ewma_latency'] is not None else "-"
+                p95 = f"{h['p95_latency']:.2f}s" if h['p95_latency'] is not None else "-"
+                lines.append(
+                    f"  {name:<45} ewma {ewma:>7}  p95 {p95:>7}  "
+                    f"err {h['error_rate']:.0%}  calls {h['calls']}  [{h['state']}]"
+                )
+
+        # Hedged requests per task type
+        hedged = {t: h for t, h in snapshot.get('hedging', {}).items() if h['requests']}
+        if hedged:
+            lines.append(f"\n🏁 HEDGING")
+            for task, h in hedged.items():
+                lines.append(
+                    f"  {task:<20} requests {h['requests']}  hedge rate {h['hedge_rate']:.0%}  "
+                    f"hedge wins {h['hedge_wins']}  latency saved {h['latency_saved']:.1f}s"
+                )
+
+        # Response cache counters
+        cache = snapshot.get('response_cache')
+        if cache and (cache['memory_hits'] + cache['disk_hits'] + cache['misses']):
+            lines.append(f"\n💾 RESPONSE CACHE")
+            lines.append(
+                f"  hits {cache['memory_hits']} memory / {cache['disk_hits']} disk  "
+                f"misses {cache['misses']}  hit rate {cache['hit_rate']:.0%}  "
+                f"entries {cache['memory_entries']}  disk {cache['disk_bytes'] / 1024:.0f} KB  "
+                f"evictions {cache['evictions']}"
+            )
+
+        # Rate limiter queues (only once calls have gone through them)
+        limited = {p: r for p, r in snapshot.get('rate_limits', {}).items() if r['calls']}
+        if limited:
+            lines.append(f"\n🚦 RATE LIMITS")
+            for provider, r in limited.items():
+                lines.append(
+                    f"  {provider:<12} calls {r['calls']}  queued {r['queued_calls']}  "
+                    f"avg wait {r['avg_wait']:.2f}s  max wait {r['max_wait']:.2f}s  "
+                    f"in flight {r['in_flight']}  waiting {r['waiting']}"
+                )
 
         if total_models == 0:
-            print("\n❌ WARNING: No working models found!")
-            print("   Check your API keys and network connection")
+            lines.append("\n❌ WARNING: No working models found!")
+            lines.append("   Check your API keys and network connection")
         elif total_models < 5:
-            print(f"\n⚠️  LIMITED: Only {total_models} models working")
-            print("   To unlock more models, add these API keys:")
-            if not self.available_providers.get('google'):
-                print("   • GOOGLE_API_KEY for Gemini 2.0 models")
-            if not self.available_providers.get('mistral'):
-                print("   • MISTRAL_API_KEY for Mistral Large")
-            if not self.available_providers.get('deepseek'):
-                print("   • DEEPSEEK_API_KEY for DeepSeek R1 Distill")
+            lines.append(f"\n⚠️  LIMITED: Only {total_models} models working")
+            lines.append("   To unlock more models, add these API keys:")
+            if not providers.get('google'):
+                lines.append("   • GOOGLE_API_KEY for Gemini 2.0 models")
+            if not providers.get('mistral'):
+                lines.append("   • MISTRAL_API_KEY for Mistral Large")
+            if not providers.get('deepseek'):
+                lines.append("   • DEEPSEEK_API_KEY for DeepSeek R1 Distill")
         else:
-            print(f"\n✅ SUCCESS: {total_models} models are working and ready!")
-            print("   You have excellent model diversity!")
-        
-        print("="*70 + "\n")
\ No newline at end of file
+            lines.append(f"\n✅ SUCCESS: {total_models} models are working and ready!")
+            lines.append("   You have excellent model diversity!")
+
+        lines.append("="*70 + "\n")
+        return "\n".join(lines)
+
+    def print_enhanced_status(self):
+        """Print detailed status of all model categories with expanded listing"""
+        print(self.format_enhanced_status())
+
+
+# Process-wide manager shared by TacticalCrew, main.py and the Gradio interface
+_shared_manager: Optional[LLMManager] = None
+_shared_manager_lock = threading.Lock()
+
+
+def get_llm_manager(config: Optional[Dict[str, Any]] = None) -> LLMManager:
+    """
+    Return the process-wide LLMManager, creating (and probing) it on first use.
+
+    Args:
+        config: `llm_manager` config section; only used by the first call
+    """
+    global _shared_manager
+    with _shared_manager_lock:
+        if _shared_manager is None:
+            _shared_manager = LLMManager(config)
+        return _shared_manager
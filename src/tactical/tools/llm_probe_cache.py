@@ -0,0 +1,92 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint_api_key(api_key: str) -> str:
+    """Short, non-reversible fingerprint of an API key (never store the key itself)"""
+    if not api_key:
+        return ""
+    return hashlib.sha256(api_key.strip().encode("utf-8")).hexdigest()[:16]
+
+
+class ProbeCache:
+    """
+    On-disk cache of LLM connectivity probe outcomes.
+
+    Each entry stores model, provider, ok/fail, probe latency, a timestamp and a
+    fingerprint of the API key that was used. An entry is only reused while it is
+    younger than `ttl_seconds` and the provider's key has not changed.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 3600):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    @staticmethod
+    def _key(model: str, provider: str) -> str:
+        return f"{provider}:{model}"
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data.get('probes', {}) if isinstance(data, dict) else {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Ignoring unreadable LLM probe cache {self.path}: {e}")
+            return {}
+
+    def get(self, model: str, provider: str, key_fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Return a fresh entry for this endpoint, or None if it must be re-probed"""
+        with self._lock:
+            entry = self._entries.get(self._key(model, provider))
+        if not entry:
+            return None
+        if entry.get('key_fingerprint') != key_fingerprint:
+            return None
+        if time.time() - entry.get('timestamp', 0) > self.ttl_seconds:
+            return None
+        return entry
+
+    def record(self, model: str, provider: str, ok: bool, latency: float, key_fingerprint: str):
+        """Store the outcome of a real probe"""
+        with self._lock:
+            self._entries[self._key(model, provider)] = {
+                'model': model,
+                'provider': provider,
+                'ok': ok,
+                'latency': round(latency, 3),
+                'timestamp': time.time(),
+                'key_fingerprint': key_fingerprint,
+            }
+
+    def invalidate(self, model: str, provider: str):
+        """Forget an endpoint so the next start re-verifies it, and persist immediately"""
+        with self._lock:
+            removed = self._entries.pop(self._key(model, provider), None)
+        if removed:
+            self.save()
+
+    def save(self):
+        """Atomically write the cache file"""
+        with self._lock:
+            data = {'probes': dict(self._entries)}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"⚠️  Could not write LLM probe cache {self.path}: {e}")
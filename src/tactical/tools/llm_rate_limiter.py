@@ -0,0 +1,144 @@
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(messages: Any) -> int:
+    """Rough prompt size in tokens (~4 characters per token) for rate limiting"""
+    if isinstance(messages, str):
+        chars = len(messages)
+    elif isinstance(messages, list):
+        chars = 0
+        for message in messages:
+            content = message.get('content', '') if isinstance(message, dict) else message
+            if isinstance(content, list):
+                # Multimodal content parts: only text parts are counted
+                content = " ".join(part.get('text', '') for part in content if isinstance(part, dict))
+            chars += len(str(content))
+    else:
+        chars = len(str(messages))
+    return max(1, chars // 4)
+
+
+class TokenBucket:
+    """Classic token bucket holding up to one minute of capacity"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0  # refill per second
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class ProviderRateLimiter:
+    """
+    Requests/min + tokens/min token buckets and a max in-flight gate for one provider.
+
+    Callers are served strictly in arrival order (ticket queue), so a burst of
+    MQTT-triggered crew runs shares the provider fairly instead of racing into
+    429s. Time spent waiting in the queue is tracked as a metric.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_in_flight: Optional[int] = None
+    ):
+        self.provider = provider
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_in_flight = int(max_in_flight) if max_in_flight else None
+
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self.in_flight = 0
+
+        # Metrics
+        self.calls = 0
+        self.queued_calls = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _wait_time(self, tokens: int) -> Optional[float]:
+        """0 if the head of the queue may go now, seconds to sleep, or None to wait for a release"""
+        if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+            return None
+        waits = [0.0]
+        if self.request_bucket:
+            waits.append(self.request_bucket.time_until(1))
+        if self.token_bucket:
+            waits.append(self.token_bucket.time_until(tokens))
+        return max(waits)
+
+    @contextmanager
+    def acquire(self, tokens: int = 1):
+        """Block (FIFO) until the call fits the provider limits, then hold an in-flight slot"""
+        started = time.monotonic()
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            while True:
+                if ticket == self._serving:
+                    wait = self._wait_time(tokens)
+                    if wait == 0.0:
+                        break
+                    self._cond.wait(timeout=wait)
+                else:
+                    self._cond.wait()
+
+            if self.request_bucket:
+                self.request_bucket.consume(1)
+            if self.token_bucket:
+                self.token_bucket.consume(tokens)
+            self.in_flight += 1
+            self._serving += 1
+
+            waited = time.monotonic() - started
+            self.calls += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            if waited > 0.01:
+                self.queued_calls += 1
+            self._cond.notify_all()
+
+        try:
+            yield waited
+        finally:
+            with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'calls': self.calls,
+                'queued_calls': self.queued_calls,
+                'waiting': self._next_ticket - self._serving,
+                'in_flight': self.in_flight,
+                'avg_wait': round(self.total_wait / self.calls, 3) if self.calls else 0.0,
+                'max_wait': round(self.max_wait, 3),
+            }
@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Call kwargs that never change the response (or are not serialisable) are left out of the key
+_UNKEYED_PARAMS = {'callbacks', 'available_functions', 'from_task', 'from_agent'}
+
+
+def make_cache_key(model: str, messages: Any, params: Dict[str, Any]) -> str:
+    """Content address of an LLM request: hash of model, messages and call parameters"""
+    payload = {
+        'model': model,
+        'messages': messages,
+        'params': {k: v for k, v in params.items() if k not in _UNKEYED_PARAMS},
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache of LLM text responses keyed by `make_cache_key`.
+
+    Tier 1 is an in-memory LRU of `max_entries` responses; tier 2 is a directory
+    of JSON files bounded to `disk_max_bytes` (oldest files are evicted first).
+    TTLs are given per lookup so each task type can use its own.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        disk_path: Optional[str] = '.cache/llm_responses',
+        disk_max_bytes: int = 50 * 1024 * 1024
+    ):
+        self.max_entries = max_entries
+        self.disk_path = Path(disk_path) if disk_path else None
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Disk index: file -> (size, mtime), used for size-bounded eviction
+        self._disk_index: Dict[Path, Tuple[int, float]] = {}
+        self._disk_bytes = 0
+        if self.disk_path and self.disk_path.exists():
+            for file in self.disk_path.glob('*/*.json'):
+                stat = file.stat()
+                self._disk_index[file] = (stat.st_size, stat.st_mtime)
+                self._disk_bytes += stat.st_size
+
+    def _file_for(self, key: str) -> Path:
+        return self.disk_path / key[:2] / f"{key}.json"
+
+    def get(self, key: str, ttl_seconds: float) -> Optional[str]:
+        """Return a cached response younger than `ttl_seconds`, or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[0] <= ttl_seconds:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+
+        if self.disk_path:
+            file = self._file_for(key)
+            try:
+                with open(file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if now - data['created'] <= ttl_seconds:
+                    with self._lock:
+                        self.disk_hits += 1
+                        self._remember(key, data['created'], data['response'])
+                    return data['response']
+            except (OSError, ValueError, KeyError):
+                pass
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, response: str):
+        created = time.time()
+        with self._lock:
+            self._remember(key, created, response)
+        if self.disk_path:
+            self._write_disk(key, created, response)
+
+    def _remember(self, key: str, created: float, response: str):
+        """Insert into the memory LRU (caller holds the lock)"""
+        self._memory[key] = (created, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _write_disk(self, key: str, created: float, response: str):
+        file = self._file_for(key)
+        try:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'created': created, 'response': response}, f)
+            os.replace(tmp_file, file)
+            size = file.stat().st_size
+        except OSError as e:
+            logger.warning(f"⚠️  Could not write LLM response cache entry: {e}")
+            return
+
+        with self._lock:
+            old_size, _ = self._disk_index.get(file, (0, 0))
+            self._disk_index[file] = (size, created)
+            self._disk_bytes += size - old_size
+            if self._disk_bytes > self.disk_max_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self):
+        """Delete the oldest files until the disk tier fits its budget (caller holds the lock)"""
+        for file, (size, _) in sorted(self._disk_index.items(), key=lambda item: item[1][1]):
+            if self._disk_bytes <= self.disk_max_bytes:
+                break
+            try:
+                file.unlink()
+            except OSError:
+                pass
+            del self._disk_index[file]
+            self._disk_bytes -= size
+            self.evictions += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'disk_bytes': self._disk_bytes,
+                'evictions': self.evictions,
+            }
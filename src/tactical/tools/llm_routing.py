@@ -0,0 +1,356 @@
+import math
+import time
+import logging
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Any, Dict, List, Optional
+from crewai import BaseLLM
+
+from src.tactical.tools.llm_response_cache import make_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+class ModelHealth:
+    """
+    Live latency / error statistics and circuit breaker for one LLM endpoint.
+
+    Latency is tracked as an EWMA plus a sliding window for percentiles; errors
+    as an EWMA of the failure indicator. After `failure_threshold` consecutive
+    failures the breaker opens and the model gets no traffic until `cooldown_seconds`
+    have passed, then a single half-open request decides whether it closes again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        ewma_alpha: float = 0.3,
+        window: int = 100,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 60
+    ):
+        self.ewma_alpha = ewma_alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+
+        self.ewma_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self.failures = 0
+        self._latencies = deque(maxlen=window)
+
+        self.state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_in_flight = False
+        self._lock = threading.Lock()
+
+    def seed_latency(self, latency: float):
+        """Use the startup probe latency as the initial estimate (no live calls yet)"""
+        with self._lock:
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+
+    def allow_request(self) -> bool:
+        """Circuit breaker admission check; may move OPEN -> HALF_OPEN after the cool-down"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+                self.state = self.HALF_OPEN
+                self._half_open_in_flight = False
+            if self.state == self.HALF_OPEN and not self._half_open_in_flight:
+                self._half_open_in_flight = True
+                return True
+            return False
+
+    def probe_due(self) -> bool:
+        """True when an open circuit has cooled down and is waiting for its half-open probe"""
+        with self._lock:
+            if self.state == self.OPEN:
+                return time.monotonic() - self._opened_at >= self.cooldown_seconds
+            return self.state == self.HALF_OPEN and not self._half_open_in_flight
+
+    def is_healthy(self) -> bool:
+        """True when the breaker is closed (open/half-open models are avoided)"""
+        return self.state == self.CLOSED
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.calls += 1
+            self._latencies.append(latency)
+            self.ewma_latency = latency if self.ewma_latency is None else (
+                self.ewma_alpha * latency + (1 - self.ewma_alpha) * self.ewma_latency
+            )
+            self.error_rate = (1 - self.ewma_alpha) * self.error_rate
+            self._consecutive_failures = 0
+            if self.state != self.CLOSED:
+                logger.info("🟢 Circuit closed after successful half-open call")
+            self.state = self.CLOSED
+            self._half_open_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.calls += 1
+            self.failures += 1
+            self.error_rate = self.ewma_alpha + (1 - self.ewma_alpha) * self.error_rate
+            self._consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._half_open_in_flight = False
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile (0-100) of the recent latency window"""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return None
+        rank = max(1, math.ceil(q / 100 * len(samples)))
+        return samples[rank - 1]
+
+    @property
+    def sample_count(self) -> int:
+        return len(self._latencies)
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.percentile(95)
+
+    def snapshot(self) -> Dict[str, Any]:
+        p95 = self.p95
+        return {
+            'state': self.state,
+            'calls': self.calls,
+            'failures': self.failures,
+            'error_rate': round(self.error_rate, 3),
+            'ewma_latency': round(self.ewma_latency, 3) if self.ewma_latency is not None else None,
+            'p95_latency': round(p95, 3) if p95 is not None else None,
+        }
+
+
+class HedgeStats:
+    """Counters for hedged requests of one task type"""
+
+    def __init__(self):
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.latency_saved = 0.0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_hedge(self):
+        with self._lock:
+            self.hedged += 1
+
+    def record_win(self):
+        with self._lock:
+            self.hedge_wins += 1
+
+    def record_saved(self, seconds: float):
+        with self._lock:
+            self.latency_saved += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'hedged': self.hedged,
+                'hedge_rate': round(self.hedged / self.requests, 3) if self.requests else 0.0,
+                'hedge_wins': self.hedge_wins,
+                'latency_saved': round(self.latency_saved, 3),
+            }
+
+
+class RoutedLLM(BaseLLM):
+    """
+    LLM handed to agents for a task type: routes every call across the task's tiers.
+
+    `tiers` is the ordered list of candidate groups (e.g. reasoning models, then
+    the fallback). Within a group the fastest healthy model (lowest latency EWMA)
+    goes first when `latency_aware` is on, otherwise the configured letter order
+    is kept. Models whose circuit is open are skipped until their cool-down ends;
+    after that they rank behind the healthy models of their group, so a half-open
+    probe is only sent when every healthy one has failed and a live call never
+    pays for a recovering model first. A failed call fails over to the next candidate.
+
+    With `hedging` settings, a call whose primary model has not answered within
+    its observed latency percentile (p90 by default) is also sent to the next
+    healthy candidate; the first answer wins and the other request is cancelled
+    (or, if already running, its result is discarded). Calls that carry
+    `available_functions` are never hedged so tools are not executed twice.
+
+    With a `response_cache`, text responses are served from / stored in the cache
+    for `cache_ttl` seconds (calls that may execute tools are never cached).
+    """
+
+    def __init__(
+        self,
+        task_type: str,
+        tiers: List[List[Any]],
+        latency_aware: bool = True,
+        hedging: Optional[Dict[str, Any]] = None,
+        response_cache: Optional[Any] = None,
+        cache_ttl: float = 3600
+    ):
+        candidates = [llm for tier in tiers for llm in tier]
+        if not candidates:
+            raise ValueError(f"No candidate models for {task_type}")
+        super().__init__(model=candidates[0].model, temperature=getattr(candidates[0], 'temperature', None))
+        self.task_type = task_type
+        self.tiers = tiers
+        self.latency_aware = latency_aware
+        self.hedging = hedging
+        self.hedge_stats = HedgeStats()
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self.response_cache = response_cache
+        self.cache_ttl = cache_ttl
+
+    @property
+    def candidates(self) -> List[Any]:
+        return [llm for tier in self.tiers for llm in tier]
+
+    def rank_candidates(self) -> List[Any]:
+        """Candidates in the order they will be tried for the next call"""
+        ranked = []
+        for tier in self.tiers:
+            healthy, probe_due, unhealthy = [], [], []
+            for llm in tier:
+                if llm.health is None or llm.health.is_healthy():
+                    healthy.append(llm)
+                elif llm.health.probe_due():
+                    probe_due.append(llm)
+                else:
+                    unhealthy.append(llm)
+            if self.latency_aware:
+                # Stable sort keeps letter order for ties; a model with no latency
+                # estimate yet (normally seeded by its probe) is tried first to get one
+                healthy.sort(key=lambda llm: llm.health.ewma_latency
+                             if llm.health and llm.health.ewma_latency is not None else 0.0)
+            ranked.extend(healthy + probe_due + unhealthy)
+        return ranked
+
+    def call(self, messages: Any, *args, **kwargs) -> Any:
+        cache_key = None
+        if self.response_cache is not None and not kwargs.get('available_functions'):
+            cache_key = make_cache_key(self.model, messages, {'args': args, **kwargs})
+            cached = self.response_cache.get(cache_key, self.cache_ttl)
+            if cached is not None:
+                logger.debug(f"💾 {self.task_type}: response served from cache")
+                return cached
+
+        ranked = self.rank_candidates()
+        if self.hedging and not kwargs.get('available_functions'):
+            result = self._hedged_call(ranked, messages, *args, **kwargs)
+        else:
+            result = self._call_in_order(ranked, messages, *args, **kwargs)
+
+        if cache_key is not None and isinstance(result, str) and result.strip():
+            self.response_cache.put(cache_key, result)
+        return result
+
+    @staticmethod
+    def _admit(llm: Any) -> bool:
+        return llm.health is None or llm.health.allow_request()
+
+    def _call_in_order(self, ranked: List[Any], messages: Any, *args, **kwargs) -> Any:
+        last_error = None
+        for llm in ranked:
+            if not self._admit(llm):
+                continue
+            try:
+                return llm.call(messages, *args, **kwargs)
+            except Exception as e:
+                last_error = e
+                logger.warning(f"↪️  {self.task_type}: {llm.model} failed, trying next model")
+        if last_error is not None:
+            raise last_error
+        raise RuntimeError(f"All models for {self.task_type} are unavailable (circuits open)")
+
+    def _hedge_delay(self, llm: Any) -> float:
+        """How long to wait for the primary before hedging: its latency percentile"""
+        settings = self.hedging
+        delay = float(settings.get('default_delay_seconds', 10))
+        health = llm.health
+        if health is not None and health.sample_count >= int(settings.get('min_samples', 5)):
+            delay = health.percentile(float(settings.get('percentile', 90)))
+        return max(float(settings.get('min_delay_seconds', 1)), delay)
+
+    def _submit(self, llm: Any, messages: Any, *args, **kwargs) -> Future:
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(
+                max_workers=int(self.hedging.get('max_workers', 8)),
+                thread_name_prefix=f"llm-hedge-{self.task_type}"
+            )
+        # Each request runs in a copy of the caller's context (tracing spans etc.)
+        context = contextvars.copy_context()
+        return self._hedge_executor.submit(context.run, llm.call, messages, *args, **kwargs)
+
+    def _hedged_call(self, ranked: List[Any], messages: Any, *args, **kwargs) -> Any:
+        primary_index = next((i for i, llm in enumerate(ranked) if self._admit(llm)), None)
+        if primary_index is None:
+            raise RuntimeError(f"All models for {self.task_type} are unavailable (circuits open)")
+        primary = ranked[primary_index]
+        rest = ranked[primary_index + 1:]
+        backup = next((llm for llm in rest if llm.health is None or llm.health.is_healthy()), None)
+
+        self.hedge_stats.record_request()
+        primary_future = self._submit(primary, messages, *args, **kwargs)
+        done, _ = wait([primary_future], timeout=self._hedge_delay(primary))
+
+        if not done and backup is not None and self._admit(backup):
+            self.hedge_stats.record_hedge()
+            logger.info(f"🏁 {self.task_type}: {primary.model} is slow, hedging with {backup.model}")
+            backup_future = self._submit(backup, messages, *args, **kwargs)
+
+            winner = None
+            pending = {primary_future, backup_future}
+            while pending and winner is None:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                winner = next((f for f in done if f.exception() is None), None)
+
+            if winner is not None:
+                loser = backup_future if winner is primary_future else primary_future
+                loser.cancel()  # no-op if already running; its result is ignored
+                if winner is backup_future:
+                    self.hedge_stats.record_win()
+                    won_at = time.monotonic()
+                    primary_future.add_done_callback(
+                        lambda _: self.hedge_stats.record_saved(time.monotonic() - won_at)
+                    )
+                return winner.result()
+
+            # Both failed: continue with the remaining candidates
+            rest = [llm for llm in rest if llm is not backup]
+            return self._call_in_order(rest, messages, *args, **kwargs)
+
+        try:
+            return primary_future.result()
+        except Exception:
+            logger.warning(f"↪️  {self.task_type}: {primary.model} failed, trying next model")
+            return self._call_in_order(rest, messages, *args, **kwargs)
+
+    def supports_function_calling(self) -> bool:
+        return self.candidates[0].supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.candidates[0].supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        # Any candidate may serve the call, so advertise the smallest window
+        return min(llm.get_context_window_size() for llm in self.candidates)
+
+    def get_token_usage_summary(self) -> Any:
+        return self.candidates[0].get_token_usage_summary()
+
+    def __repr__(self) -> str:
+        return f"RoutedLLM(task={self.task_type!r}, models={[llm.model for llm in self.candidates]!r})"
@@ -0,0 +1,203 @@
+"""
+Deterministic local stand-in for a cloud LLM ("local" provider in LLMManager).
+
+Used to run the full TacticalCrew flow offline for load and regression tests:
+responses come from templates, latency and token rate are drawn from seeded
+distributions, so the same prompt always gives the same answer and timing.
+Tool calls are emitted in the ReAct text format CrewAI parses for models
+without native function calling.
+"""
+
+import re
+import json
+import math
+import time
+import random
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+from crewai import BaseLLM
+
+logger = logging.getLogger(__name__)
+
+
+# Canned answers per agent role (matched against the system prompt)
+DEFAULT_RESPONSES = [
+    {
+        'match': "You are Threat Analyst",
+        'response': (
+            "## Threat Analysis (local fake model)\n"
+            "- Input excerpt: {excerpt}\n"
+            "- Entity 1: 3 armed personnel, classification UNKNOWN, threat level MEDIUM\n"
+            "- Entity 2: 2 light vehicles, classification UNKNOWN, threat level LOW\n"
+            "- Location: not verified (offline run)"
+        ),
+    },
+    {
+        'match': "You are Intelligence Report Generator",
+        'response': (
+            "## SITREP (local fake model)\n"
+            "SITUATION: Unverified hostile activity reported.\n"
+            "ENEMY: 3 armed personnel, 2 light vehicles.\n"
+            "ASSESSMENT: Threat level MEDIUM."
+        ),
+    },
+    {
+        'match': "You are Tactical Advisor",
+        'response': (
+            "## Tactical Response (local fake model)\n"
+            "RECOMMENDED ACTION: Maintain observation, request ISR coverage, hold position.\n"
+            "RISK: Low to friendly forces."
+        ),
+    },
+]
+
+DEFAULT_TEMPLATE = "Local fake response from {model} ({prompt_tokens} prompt tokens)."
+
+
+class _SafeFormat(dict):
+    """Leave unknown {placeholders} untouched when rendering templates"""
+
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+def _format_template(template: str, values: _SafeFormat) -> str:
+    """
+    str.format_map that never raises: templates with literal braces (JSON
+    examples, "{0}", "{a.b}") only get their plain {name} placeholders filled.
+    """
+    try:
+        return template.format_map(values)
+    except (ValueError, KeyError, IndexError, AttributeError):
+        return re.sub(r"\{(\w+)\}", lambda m: str(values.get(m.group(1), m.group(0))), template)
+
+
+def _messages_to_text(messages: Any) -> str:
+    if isinstance(messages, str):
+        return messages
+    if isinstance(messages, list):
+        parts = []
+        for message in messages:
+            content = message.get('content', '') if isinstance(message, dict) else message
+            if isinstance(content, list):
+                content = " ".join(p.get('text', '') for p in content if isinstance(p, dict))
+            parts.append(str(content))
+        return "\n".join(parts)
+    return str(messages)
+
+
+def _last_user_text(messages: Any) -> str:
+    if isinstance(messages, list):
+        for message in reversed(messages):
+            if isinstance(message, dict) and message.get('role') == 'user':
+                return _messages_to_text([message])
+    return _messages_to_text(messages)
+
+
+class LocalFakeLLM(BaseLLM):
+    """
+    Offline, deterministic LLM with configurable latency and token-rate distributions.
+
+    Args:
+        model: Model name shown in status / routing (e.g. "local/fake-reasoning")
+        responses: Ordered rules {match, response, tool, tool_input}; `match` is a
+            regex searched in the whole prompt, the first matching rule wins. A rule
+            with `tool` first answers with a ReAct tool call, then (once the
+            observation is in the conversation) with its `response`.
+        latency: {median_seconds, sigma} of the lognormal time-to-first-token
+        tokens_per_second: {mean, stddev} of the normal output token rate
+        seed: Base seed; combined with the prompt hash for per-prompt determinism
+    """
+
+    def __init__(
+        self,
+        model: str = "local/fake",
+        responses: Optional[List[Dict[str, Any]]] = None,
+        latency: Optional[Dict[str, float]] = None,
+        tokens_per_second: Optional[Dict[str, float]] = None,
+        seed: int = 0,
+        **kwargs
+    ):
+        super().__init__(model=model, temperature=0)
+        self.responses = list(responses or []) + DEFAULT_RESPONSES
+        latency = latency or {}
+        self.latency_median = float(latency.get('median_seconds', 0.5))
+        self.latency_sigma = float(latency.get('sigma', 0.25))
+        rate = tokens_per_second or {}
+        self.tokens_per_second_mean = float(rate.get('mean', 80))
+        self.tokens_per_second_stddev = float(rate.get('stddev', 10))
+        self.seed = seed
+
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def _rng(self, prompt: str) -> random.Random:
+        digest = hashlib.sha256(f"{self.seed}:{self.model}:{prompt}".encode('utf-8')).hexdigest()
+        return random.Random(int(digest[:16], 16))
+
+    def _render(self, prompt: str, messages: Any) -> str:
+        values = _SafeFormat(
+            model=self.model,
+            prompt_tokens=max(1, len(prompt) // 4),
+            excerpt=_last_user_text(messages)[:200].replace("\n", " "),
+        )
+        for rule in self.responses:
+            if not re.search(rule.get('match', ''), prompt):
+                continue
+            tool = rule.get('tool')
+            if tool and f"Action: {tool}" not in prompt:
+                tool_input = json.dumps(rule.get('tool_input', {}))
+                return (
+                    f"Thought: I should use the {tool} tool first.\n"
+                    f"Action: {tool}\n"
+                    f"Action Input: {tool_input}"
+                )
+            body = _format_template(rule.get('response', DEFAULT_TEMPLATE), values)
+            break
+        else:
+            body = _format_template(DEFAULT_TEMPLATE, values)
+        return f"Thought: I now know the final answer\nFinal Answer: {body}"
+
+    def call(self, messages: Any, *args, **kwargs) -> str:
+        prompt = _messages_to_text(messages)
+        response = self._render(prompt, messages)
+
+        # Deterministic timing: lognormal first-token latency + output tokens / token rate
+        rng = self._rng(prompt)
+        first_token = rng.lognormvariate(math.log(max(self.latency_median, 1e-6)), self.latency_sigma)
+        rate = max(1.0, rng.gauss(self.tokens_per_second_mean, self.tokens_per_second_stddev))
+        output_tokens = max(1, len(response) // 4)
+        time.sleep(first_token + output_tokens / rate)
+
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += max(1, len(prompt) // 4)
+            self.completion_tokens += output_tokens
+        return response
+
+    def supports_function_calling(self) -> bool:
+        # Tool calls are produced as ReAct text, parsed by CrewAI
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 128000
+
+    def get_token_usage_summary(self) -> Any:
+        from crewai.types.usage_metrics import UsageMetrics
+        with self._lock:
+            return UsageMetrics(
+                total_tokens=self.prompt_tokens + self.completion_tokens,
+                prompt_tokens=self.prompt_tokens,
+                completion_tokens=self.completion_tokens,
+                successful_requests=self.calls
+            )
+
+    def __repr__(self) -> str:
+        return f"LocalFakeLLM(model={self.model!r})"
@@ -0,0 +1,78 @@
+import time
+import logging
+from typing import Any, Callable, Optional
+from crewai import LLM, BaseLLM
+
+from src.tactical.tools.llm_rate_limiter import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class ManagedLLM(BaseLLM):
+    """
+    BaseLLM wrapper around a probed LLM client handed out by LLMManager.
+
+    Calls are forwarded unchanged to the wrapped client after passing the
+    provider's `rate_limiter` (if any). Every call's latency (excluding queue
+    wait) and outcome is recorded in `health` (used for routing and circuit
+    breaking), and runtime failures are reported back through
+    `on_failure(model, provider, error)`.
+    Any attribute not defined here is read from the wrapped client.
+    """
+
+    def __init__(
+        self,
+        llm: LLM,
+        provider: str,
+        on_failure: Optional[Callable[[str, str, Exception], None]] = None,
+        health: Optional[Any] = None,
+        rate_limiter: Optional[Any] = None
+    ):
+        super().__init__(model=llm.model, temperature=getattr(llm, 'temperature', None))
+        self.llm = llm
+        self.provider = provider
+        self._on_failure = on_failure
+        self.health = health
+        self.rate_limiter = rate_limiter
+
+    def call(self, messages: Any, *args, **kwargs) -> Any:
+        if self.rate_limiter is None:
+            return self._timed_call(messages, *args, **kwargs)
+        with self.rate_limiter.acquire(estimate_tokens(messages)):
+            return self._timed_call(messages, *args, **kwargs)
+
+    def _timed_call(self, messages: Any, *args, **kwargs) -> Any:
+        started = time.monotonic()
+        try:
+            result = self.llm.call(messages, *args, **kwargs)
+        except Exception as e:
+            if self.health is not None:
+                self.health.record_failure()
+            if self._on_failure:
+                self._on_failure(self.model, self.provider, e)
+            raise
+        if self.health is not None:
+            self.health.record_success(time.monotonic() - started)
+        return result
+
+    def supports_function_calling(self) -> bool:
+        return self.llm.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.llm.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.llm.get_context_window_size()
+
+    def get_token_usage_summary(self) -> Any:
+        return self.llm.get_token_usage_summary()
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes missing on the wrapper itself
+        llm = self.__dict__.get('llm')
+        if llm is None:
+            raise AttributeError(name)
+        return getattr(llm, name)
+
+    def __repr__(self) -> str:
+        return f"ManagedLLM(model={self.model!r}, provider={self.provider!r})"
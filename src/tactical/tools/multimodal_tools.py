@@ -1,10 +1,9 @@
 import os
-import tempfile
-from typing import Any, Optional, Type
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Type
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 from pathlib import Path
-import subprocess
 
 
 """
@@ -12,6 +11,14 @@ Tools created for:
     - text-based (DocumentAnalysisTool): analyzes text documents, PDFs, and other written reports for threat intelligence.
     - audio-based (AudioTranscriptionTool): transcribes audio files (mp3, wav, m4a, etc.) into text for threat analysis.
             The parameter NUM_SPEAKERS has been set to 2, which is the common in military conversations.
+            The audio is decoded once into a 16 kHz mono buffer; diarization and every speaker turn work on it in memory.
+            transcription_mode "single_pass" runs Whisper once over the whole recording with word timestamps and
+            assigns the words to the speaker turns by time overlap; "per_turn" transcribes each turn separately.
+            Before transcription, same-speaker turns separated by short pauses are merged and micro-turns are
+            absorbed or dropped; per_turn packs the remaining turns into ~30 s batches (one Whisper call each).
+            With a VoiceActivityDetector (`vad`), dead air (squelch, carrier noise, silence) is cut before
+            diarization, so pyannote and Whisper only process the speech regions.
+            The speech model is a pluggable backend (openai-whisper, or faster-whisper with int8 weights on CPU).
 
 For image-based inputs, the LLM itself handles it.
 """
@@ -49,6 +56,99 @@ class InputTypeDeterminerInput(BaseModel):
 # AUDIO TRANSCRIPTION TOOL
 # ============================================================================
 
+SAMPLE_RATE = 16000  # Whisper's native rate; pyannote resamples internally if needed
+SINGLE_PASS = "single_pass"
+PER_TURN = "per_turn"
+BATCH_SILENCE_SECONDS = 0.5  # Silence between turns packed into one Whisper call
+# Concurrent missions share the tool instance: load each model only once
+_SPEECH_MODEL_LOCK = threading.Lock()
+_DIARIZATION_LOCK = threading.Lock()
+
+
+def align_words_to_turns(
+    words: List[Tuple[float, float, str]],
+    turns: List[Tuple[float, float, str]]
+) -> List[Tuple[str, str]]:
+    """
+    Assign time-stamped words (start, end, text) to diarization turns (start, end, speaker).
+
+    Each word goes to the turn it overlaps most; words falling in a gap go to the
+    nearest turn. Consecutive words of the same speaker are joined into one line,
+    returned as (speaker, text). Both inputs must be sorted by start time.
+    """
+    lines = []
+    if not turns:
+        return lines
+    first = 0  # turns before this one ended before the current word
+    for start, end, text in words:
+        while first < len(turns) - 1 and turns[first][1] <= start:
+            first += 1
+        best, best_score = None, None
+        index = max(0, first - 1)
+        while index < len(turns) and (index <= first or turns[index][0] < end):
+            turn_start, turn_end, speaker = turns[index]
+            overlap = min(end, turn_end) - max(start, turn_start)
+            # Positive = overlap; negative = distance to the turn (gap words)
+            if best_score is None or overlap > best_score:
+                best, best_score = speaker, overlap
+            index += 1
+        if lines and lines[-1][0] == best:
+            lines[-1] = (best, lines[-1][1] + text)
+        else:
+            lines.append((best, text))
+    return [(speaker, text.strip()) for speaker, text in lines if text.strip()]
+
+
+def format_turns(turns: List[Tuple[float, float, str]], limit: int = 10) -> str:
+    """"SPEAKER_00 0:03.2-0:15.8, SPEAKER_01 0:16.0-0:21.4, ..." for the report"""
+    def clock(seconds):
+        return f"{int(seconds // 60)}:{seconds % 60:04.1f}"
+    shown = [f"{speaker} {clock(start)}-{clock(end)}" for start, end, speaker in turns[:limit]]
+    if len(turns) > limit:
+        shown.append(f"... ({len(turns) - limit} more)")
+    return ", ".join(shown) or "none"
+
+
+def merge_turns(
+    turns: List[Tuple[float, float, str]],
+    max_gap: float = 0.5,
+    min_duration: float = 0.3
+) -> List[Tuple[float, float, str]]:
+    """
+    Clean up diarization turns (start, end, speaker), sorted by start time:
+      - consecutive turns of the same speaker less than `max_gap` seconds apart are merged
+      - turns shorter than `min_duration` are absorbed by the closer neighbour
+        (if it is within `max_gap`), otherwise dropped as noise
+    """
+    merged = []
+    for start, end, speaker in turns:
+        if merged and merged[-1][2] == speaker and start - merged[-1][1] <= max_gap:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]), speaker)
+        else:
+            merged.append((start, end, speaker))
+    if min_duration <= 0:
+        return merged
+
+    kept = []
+    for index, (start, end, speaker) in enumerate(merged):
+        if end - start >= min_duration:
+            kept.append((start, end, speaker))
+            continue
+        following = merged[index + 1] if index + 1 < len(merged) else None
+        gap_before = start - kept[-1][1] if kept else float('inf')
+        gap_after = following[0] - end if following else float('inf')
+        if min(gap_before, gap_after) > max_gap:
+            continue  # isolated blip
+        if gap_before <= gap_after:
+            previous = kept[-1]
+            kept[-1] = (previous[0], max(previous[1], end), previous[2])
+        else:
+            merged[index + 1] = (start, following[1], following[2])
+
+    # Absorbing micro-turns can leave same-speaker turns back to back
+    return merge_turns(kept, max_gap=max_gap, min_duration=0)
+
+
 class AudioTranscriptionTool(BaseTool):
     """Transcribes audio files into text with speaker diarization"""
     name: str = "Audio Transcription Tool"
@@ -59,60 +159,157 @@ class AudioTranscriptionTool(BaseTool):
     )
     args_schema: Type[BaseModel] = AudioTranscriptionInput
     
-    whisper_model: Optional[Any] = None
+    whisper_model: Optional[Any] = None   # Loaded speech backend (see speech_backends.py)
+    speech_backend: str = "openai-whisper"  # openai-whisper | faster-whisper (`audio.backend`)
+    speech_settings: Dict[str, Any] = Field(default_factory=dict)  # model_size, device, compute_type, ...
     diarization_pipeline: Optional[Any] = None
+    transcription_mode: str = SINGLE_PASS  # single_pass | per_turn (`audio.transcription_mode`)
+    merge_gap_seconds: float = 0.5        # Same-speaker pause merged into one turn (`audio.turns`)
+    min_turn_seconds: float = 0.3         # Shorter turns are absorbed or dropped (0 = keep all)
+    batch_seconds: float = 30.0           # per_turn: turns packed per Whisper call (0 = one call per turn)
+    vad: Optional[Any] = None             # VoiceActivityDetector run before diarization (`audio.vad`)
 
     def _load_whisper_model(self):
-        """Lazy load whisper model only when needed"""
+        """Lazy load the speech backend (`speech_backend`) only when needed"""
         if self.whisper_model is None:
-            try:
-                import whisper  # Import only when needed
-                self.whisper_model = whisper.load_model("base")
-            except ImportError:
-                raise ImportError(
-                    "Whisper is not installed. Install it with: pip install openai-whisper"
-                )
+            with _SPEECH_MODEL_LOCK:
+                if self.whisper_model is None:
+                    from src.tactical.tools.speech_backends import load_speech_backend  # Import only when needed
+                    self.whisper_model = load_speech_backend(self.speech_backend, **self.speech_settings)
         return self.whisper_model
 
     def _load_diarization_pipeline(self):
         """Lazy load diarization pipeline only when needed"""
         if self.diarization_pipeline is None:
-            try:
-                from pyannote.audio import Pipeline  # Import only when needed
-                hf_token = os.getenv("HF_TOKEN", None)
+            with _DIARIZATION_LOCK:
+                if self.diarization_pipeline is None:
+                    try:
+                        from pyannote.audio import Pipeline  # Import only when needed
+                        hf_token = os.getenv("HF_TOKEN", None)
                 
-                if not hf_token:
-                    raise ValueError(
-                        "HF_TOKEN not found in environment. "
-                        "Get your token from https://huggingface.co/settings/tokens"
-                    )
+                        if not hf_token:
+                            raise ValueError(
+                                "HF_TOKEN not found in environment. "
+                                "Get your token from https://huggingface.co/settings/tokens"
+                            )
                 
-                print(f"Loading pyannote speaker-diarization model...")
-                self.diarization_pipeline = Pipeline.from_pretrained(
-                    "pyannote/speaker-diarization-3.1",
-                    use_auth_token=hf_token
-                )
-                print("✅ Diarization model loaded successfully")
-
-            except Exception as e:
-                error_msg = str(e)
-                if "gated" in error_msg.lower() or "private" in error_msg.lower():
-                    raise ValueError(
-                        "Error accessing the pyannote model. Authentication failed for pyannote model'."
-                    )
-
-                raise ImportError(
-                    f"Pyannote.audio dependencies not available: {e}\n"
-                    "This may be due to PyTorch compatibility issues on your system."
-                )
+                        print(f"Loading pyannote speaker-diarization model...")
+                        self.diarization_pipeline = Pipeline.from_pretrained(
+                            "pyannote/speaker-diarization-3.1",
+                            use_auth_token=hf_token
+                        )
+                        print("✅ Diarization model loaded successfully")
+
+                    except Exception as e:
+                        error_msg = str(e)
+                        if "gated" in error_msg.lower() or "private" in error_msg.lower():
+                            raise ValueError(
+                                "Error accessing the pyannote model. Authentication failed for pyannote model'."
+                            )
+
+                        raise ImportError(
+                            f"Pyannote.audio dependencies not available: {e}\n"
+                            "This may be due to PyTorch compatibility issues on your system."
+                        )
         return self.diarization_pipeline
     
+    def _load_audio(self, audio_path: str):
+        """Decode the whole file once into a 16 kHz mono float32 array (with the backend's decoder)"""
+        return self._load_whisper_model().load_audio(audio_path)
+
+    def _diarize(self, diar_pipeline, audio, num_speakers: int):
+        """Run pyannote on the in-memory waveform instead of re-reading the file"""
+        import torch  # Import only when needed
+        waveform = torch.from_numpy(audio).unsqueeze(0)  # (channel, time), shares memory with `audio`
+        return diar_pipeline({"waveform": waveform, "sample_rate": SAMPLE_RATE}, num_speakers=num_speakers)
+
+    def _transcribe_single_pass(self, model, audio, turns):
+        """
+        One Whisper pass over the whole recording (language detected once, context
+        kept across turns); words are assigned to speaker turns by time overlap.
+        Returns ([(speaker, text)], language).
+        """
+        result = model.transcribe(audio, language=None, word_timestamps=True)
+        words = [
+            (word["start"], word["end"], word["word"])
+            for segment in result.get("segments", [])
+            for word in segment.get("words", [])
+        ]
+        return align_words_to_turns(words, turns), result.get("language")
+
+    def _batches(self, turns):
+        """Consecutive turns grouped up to batch_seconds of speech (a longer turn is its own batch)"""
+        batch, length = [], 0.0
+        for turn in turns:
+            duration = turn[1] - turn[0]
+            if batch and length + duration > self.batch_seconds:
+                yield batch
+                batch, length = [], 0.0
+            batch.append(turn)
+            length += duration + BATCH_SILENCE_SECONDS
+        if batch:
+            yield batch
+
+    def _transcribe_per_turn(self, model, audio, turns):
+        """
+        Fallback: Whisper on the turns only. Turns are packed into batches of
+        up to batch_seconds (separated by short silences) and the words of each
+        batch are mapped back to their turn; language is detected on the first
+        batch and reused. Returns [(speaker, text)]
+        """
+        if self.batch_seconds <= 0:
+            return self._transcribe_each_turn(model, audio, turns)
+
+        import numpy as np  # Import only when needed
+        silence = np.zeros(int(BATCH_SILENCE_SECONDS * SAMPLE_RATE), dtype=audio.dtype)
+        lines, language = [], None
+        for batch in self._batches(turns):
+            pieces, spans, offset = [], [], 0
+            for turn_start, turn_end, speaker in batch:
+                start = max(0, int(turn_start * SAMPLE_RATE))
+                end = min(len(audio), int(turn_end * SAMPLE_RATE))
+                if end <= start:
+                    continue
+                pieces.extend((audio[start:end], silence))
+                spans.append((offset / SAMPLE_RATE, (offset + end - start) / SAMPLE_RATE, speaker))
+                offset += end - start + len(silence)
+            if not pieces:
+                continue
+            result = model.transcribe(np.concatenate(pieces), language=language, word_timestamps=True)
+            language = language or result.get("language")
+            words = [
+                (word["start"], word["end"], word["word"])
+                for segment in result.get("segments", [])
+                for word in segment.get("words", [])
+            ]
+            for speaker, text in align_words_to_turns(words, spans):
+                if lines and lines[-1][0] == speaker:
+                    lines[-1] = (speaker, f"{lines[-1][1]} {text}")
+                else:
+                    lines.append((speaker, text))
+        return lines
+
+    def _transcribe_each_turn(self, model, audio, turns):
+        """Whisper on each turn separately. Returns [(speaker, text)]"""
+        lines = []
+        for turn_start, turn_end, speaker in turns:
+            start = max(0, int(turn_start * SAMPLE_RATE))
+            end = min(len(audio), int(turn_end * SAMPLE_RATE))
+            if end <= start:
+                continue
+            # Zero-copy slice of the decoded audio, passed straight to Whisper
+            result = model.transcribe(audio[start:end], language=None)
+            transcription = result["text"].strip()
+            if transcription:
+                lines.append((speaker, transcription))
+        return lines
+
     def _run(self, audio_path: str) -> str:
         try:
             if not os.path.exists(audio_path):
                 return f"Error: Audio file not found at {audio_path}"
 
-            # Step 1: Execute diarization
+            # Step 1: Load models
             try:
                 diar_pipeline = self._load_diarization_pipeline()
                 model = self._load_whisper_model()
@@ -123,30 +320,54 @@ class AudioTranscriptionTool(BaseTool):
                     f"WORKAROUND: Audio transcription requires:\n"
                     f"1. Working PyTorch installation\n"
                     f"2. pyannote.audio\n"
-                    f"3. HuggingFace token (HF_TOKEN in .env)\n\n"
+                    f"3. HuggingFace token (HF_TOKEN in .env)\n"
+                    f"4. The speech backend set in audio.backend ({self.speech_backend})\n\n"
                 )
-            
+
+            # Step 2: Decode once; every turn below is a view into this buffer
+            audio = self._load_audio(audio_path)
+
+            # Step 3: Cut dead air; models work on the compacted audio, turn
+            # decisions and the report on the original timeline (speech_map)
+            speech_map = None
+            voice_activity = "not checked (VAD disabled)"
+            if self.vad is not None:
+                speech_map = self.vad.detect(audio)
+                print(f"🎙️  VAD {os.path.basename(audio_path)}: {speech_map.summary()}")
+                if not speech_map.regions:
+                    # Never drop a recording on the VAD's word alone: transcribe it whole
+                    voice_activity = "no speech regions found - transcribed the untrimmed audio"
+                    speech_map = None
+                else:
+                    voice_activity = f"{speech_map.summary()}\n            Speech regions: {speech_map.format_regions()}"
+                    audio = speech_map.compact(audio)
+
+            # Step 4: Execute diarization
             NUM_SPEAKERS = 2  # Force 2 speakers for military conversations
-            diarization = diar_pipeline(audio_path, num_speakers=NUM_SPEAKERS)
-
-            # Step 2: Load Whisper model
-            model = self._load_whisper_model()
-
-            # Step 3: Create speaker-labeled text
-            segments = []
-            for turn, _, speaker in diarization.itertracks(yield_label=True):
-                start, end = turn.start, turn.end
-                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_segment:
-                    # Extract corresponding segment
-                    subprocess.run([
-                        "ffmpeg", "-y", "-i", audio_path,
-                        "-ss", str(start), "-to", str(end),
-                        "-ar", "16000", "-ac", "1", tmp_segment.name
-                    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                    result = model.transcribe(tmp_segment.name, language=None)
-                    transcription = result["text"].strip()
-                    if transcription:
-                        segments.append(f"{speaker}: {transcription}")
+            diarization = self._diarize(diar_pipeline, audio, NUM_SPEAKERS)
+
+            # Step 5: Create speaker-labeled text
+            diarized = sorted((turn.start, turn.end, speaker)
+                              for turn, _, speaker in diarization.itertracks(yield_label=True))
+            if speech_map is not None:
+                # Merge gaps are measured on the real recording: turns far apart there
+                # sit back to back in the compacted audio
+                diarized = speech_map.map_turns(diarized)
+            turns = merge_turns(diarized, max_gap=self.merge_gap_seconds, min_duration=self.min_turn_seconds)
+            timeline = format_turns(turns)
+            if speech_map is not None:
+                turns = speech_map.compact_turns(turns)  # offsets into `audio` for slicing / alignment
+            lines, language, mode = None, None, PER_TURN
+            if self.transcription_mode == SINGLE_PASS:
+                try:
+                    lines, language = self._transcribe_single_pass(model, audio, turns)
+                    mode = SINGLE_PASS
+                except Exception as e:
+                    print(f"⚠️  Single-pass transcription failed ({e}), transcribing per turn")
+            if not lines:
+                lines = self._transcribe_per_turn(model, audio, turns)
+                mode = PER_TURN
+            segments = [f"{speaker}: {text}" for speaker, text in lines]
 
             full_transcription = "\n".join(segments)
 
@@ -154,6 +375,10 @@ class AudioTranscriptionTool(BaseTool):
             AUDIO TRANSCRIPTION REPORT:
             ==========================
             Speakers detected: {NUM_SPEAKERS}
+            Language: {language or 'auto (per turn)'}
+            Transcription mode: {mode}
+            Speaker turns: {len(turns)} ({len(diarized)} before merging): {timeline}
+            Voice activity: {voice_activity}
             Transcription:
             {full_transcription}
             ==========================
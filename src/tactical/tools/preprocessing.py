@@ -0,0 +1,212 @@
+"""
+Deterministic preprocessing run in Python before the crew is kicked off.
+
+The threat analyst used to spend one LLM round trip per tool decision
+(input type -> EXIF -> GPS -> transcription/document -> location). The
+MissionPreprocessor classifies the input itself and runs the relevant
+extractors concurrently; their reports are passed to the tasks as
+{preprocessed_context}.
+"""
+
+import os
+import time
+import logging
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from src.tactical.tools.multimodal_tools import AudioTranscriptionTool, DocumentAnalysisTool
+from src.tactical.tools.location_tools import LocationContextTool
+from src.tactical.tools.exif_tools import ExifMetadataExtractor, GPSFromExifTool
+
+logger = logging.getLogger(__name__)
+
+
+AUDIO_EXTENSIONS = {'.mp3', '.wav', '.m4a', '.flac', '.ogg'}
+DOCUMENT_EXTENSIONS = {'.txt', '.pdf', '.doc', '.docx'}
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif'}
+
+# Leading bytes of common formats, for files with a missing or wrong extension
+MAGIC_NUMBERS = [
+    (b'ID3', 'audio'),
+    (b'fLaC', 'audio'),
+    (b'OggS', 'audio'),
+    (b'%PDF', 'document'),
+    (b'\x89PNG', 'image'),
+    (b'\xff\xd8\xff', 'image'),
+    (b'GIF8', 'image'),
+    (b'BM', 'image'),
+]
+
+PREPROCESSING_DISABLED = "None - preprocessing disabled, follow the execution sequence below."
+
+# How often a waiting mission checks whether its queued extractor has started
+QUEUE_POLL_SECONDS = 0.1
+
+
+def classify_input(mission_input: Optional[str]) -> str:
+    """Return 'audio', 'image', 'document', 'file' (unsupported) or 'text'"""
+    if not mission_input or not os.path.isfile(mission_input):
+        return 'text'
+
+    extension = Path(mission_input).suffix.lower()
+    if extension in AUDIO_EXTENSIONS:
+        return 'audio'
+    if extension in IMAGE_EXTENSIONS:
+        return 'image'
+    if extension in DOCUMENT_EXTENSIONS:
+        return 'document'
+
+    try:
+        with open(mission_input, 'rb') as f:
+            header = f.read(16)
+    except OSError:
+        return 'file'
+    if header[:4] == b'RIFF':
+        return 'audio' if header[8:12] == b'WAVE' else 'file'
+    if header[4:8] == b'ftyp':
+        return 'audio'  # MP4/M4A container
+    for magic, kind in MAGIC_NUMBERS:
+        if header.startswith(magic):
+            return kind
+    return 'file'
+
+
+class _Extraction:
+    """One submitted extractor call; `started_at` is set when a pool thread picks it up"""
+
+    def __init__(self, executor: ThreadPoolExecutor, tool: Any, kwargs: Dict[str, Any]):
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.future = executor.submit(self._run, tool, kwargs)
+
+    def _run(self, tool: Any, kwargs: Dict[str, Any]):
+        self.started_at = time.monotonic()
+        return tool.run(**kwargs), time.monotonic() - self.started_at
+
+
+class MissionPreprocessor:
+    """
+    Runs the extractors relevant to a mission input concurrently.
+
+    Args:
+        tools: Tool instances to reuse (the crew's custom tools, so heavy models
+            such as Whisper are loaded once); missing ones are created
+        max_workers: Extractor threads shared by all missions
+        timeout_seconds: Limit for each extractor, counted from when a pool thread
+            starts it (time spent queued behind other missions does not count). An
+            extractor still queued after as long is cancelled and left for the agent;
+            one still running is reported as such (it cannot be interrupted, and
+            calling the tool again would only duplicate the work)
+    """
+
+    def __init__(self, tools: Optional[List[Any]] = None, max_workers: int = 4, timeout_seconds: float = 300):
+        tools = tools or []
+        self.exif_tool = self._find(tools, ExifMetadataExtractor)
+        self.gps_tool = self._find(tools, GPSFromExifTool)
+        self.audio_tool = self._find(tools, AudioTranscriptionTool)
+        self.document_tool = self._find(tools, DocumentAnalysisTool)
+        self.location_tool = self._find(tools, LocationContextTool)
+        self.timeout_seconds = timeout_seconds
+        self.executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="preprocess")
+
+    @staticmethod
+    def _find(tools: List[Any], tool_class: type) -> Any:
+        for tool in tools:
+            if isinstance(tool, tool_class):
+                return tool
+        return tool_class()
+
+    def _submit(self, tool: Any, **kwargs) -> _Extraction:
+        return _Extraction(self.executor, tool, kwargs)
+
+    def _collect(self, name: str, job: _Extraction, reports: Dict[str, str], timings: Dict[str, float]) -> str:
+        """Result of one extractor, waiting at most timeout_seconds for it to start and as long to run"""
+        report = None
+        while report is None and not job.future.done():
+            now = time.monotonic()
+            if job.started_at is None:
+                if now - job.submitted_at < self.timeout_seconds:
+                    wait([job.future], timeout=QUEUE_POLL_SECONDS)
+                elif job.future.cancel():
+                    report = (f"SKIPPED: {name} was still queued after {self.timeout_seconds:.0f}s "
+                              f"(extractor pool busy) and was cancelled")
+                # else: it started just now, the next pass waits on its run deadline
+            else:
+                remaining = job.started_at + self.timeout_seconds - now
+                if remaining > 0:
+                    wait([job.future], timeout=remaining)
+                else:
+                    # A running tool call cannot be interrupted: it finishes in the background
+                    report = (f"TIMEOUT: {name} did not finish within {self.timeout_seconds:.0f}s "
+                              f"and is still running")
+                    timings[name] = self.timeout_seconds
+        if report is None:
+            try:
+                report, timings[name] = job.future.result()
+            except Exception as e:
+                report = f"ERROR: {name} failed: {e}"
+        report = str(report).strip()
+        reports[name] = report
+        return report
+
+    def run(self, mission_input: Optional[str], location_input: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Classify the input and run its extractors.
+
+        Returns:
+            {'input_type', 'reports' (extractor -> text), 'timings' (extractor -> s),
+             'context' (text for the {preprocessed_context} placeholder)}
+        """
+        input_type = classify_input(mission_input)
+        reports: Dict[str, str] = {}
+        timings: Dict[str, float] = {}
+
+        pending = {}
+        if input_type in ('audio', 'image'):
+            pending['exif_metadata'] = self._submit(self.exif_tool, file_path=mission_input)
+            pending['gps'] = self._submit(self.gps_tool, file_path=mission_input)
+        if input_type == 'audio':
+            pending['transcription'] = self._submit(self.audio_tool, audio_path=mission_input)
+        elif input_type == 'document':
+            pending['document'] = self._submit(self.document_tool, document_path=mission_input)
+
+        # Location priority: user input > EXIF GPS > IP lookup. Only the GPS case
+        # has to wait for another extractor.
+        if location_input or 'gps' not in pending:
+            pending['location'] = self._submit(self.location_tool, location_input=location_input)
+        else:
+            gps = self._collect('gps', pending.pop('gps'), reports, timings)
+            has_gps = gps and not gps.startswith(('NO_GPS', 'ERROR', 'TIMEOUT', 'SKIPPED'))
+            pending['location'] = self._submit(self.location_tool, location_input=gps if has_gps else None)
+
+        # Deadlines are per extractor, so collecting one after the other adds no waiting
+        for name, job in pending.items():
+            self._collect(name, job, reports, timings)
+
+        return {
+            'input_type': input_type,
+            'reports': reports,
+            'timings': timings,
+            'context': self.format_context(input_type, reports),
+        }
+
+    @staticmethod
+    def format_context(input_type: str, reports: Dict[str, str]) -> str:
+        titles = {
+            'exif_metadata': "EXIF METADATA (EXIF Metadata Extractor)",
+            'gps': "GPS FROM EXIF (GPS From EXIF Tool)",
+            'transcription': "AUDIO TRANSCRIPTION (Audio Transcription Tool)",
+            'document': "DOCUMENT CONTENT (Document Analysis Tool)",
+            'location': "LOCATION CONTEXT (Location Context Tool)",
+        }
+        lines = [
+            f"INPUT TYPE: {input_type.upper()}",
+            "The tools below were already run on this input - use their results and do not call them again "
+            "unless a result is an ERROR or SKIPPED. A TIMEOUT tool is still running: calling it again "
+            "would only duplicate the work.",
+        ]
+        for name, title in titles.items():
+            if name in reports:
+                lines.extend(["", f"--- {title} ---", reports[name]])
+        return "\n".join(lines)
@@ -0,0 +1,146 @@
+"""
+Speech-to-text backends for AudioTranscriptionTool.
+
+Every backend exposes the same two calls, so the tool does not care which one
+is loaded:
+    load_audio(path)                          -> 16 kHz mono float32 NumPy array
+    transcribe(audio, language, word_timestamps) -> openai-whisper style dict
+        {'text', 'language', 'segments': [{'start', 'end', 'text', 'words': [{'start', 'end', 'word'}]}]}
+
+Backends (`audio.backend` in execution_config.yaml):
+    - openai-whisper: the PyTorch reference implementation (fp32 on CPU)
+    - faster-whisper: CTranslate2 implementation; with compute_type int8 it is the
+      fastest and smallest option on CPU-only hosts
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+OPENAI_WHISPER = "openai-whisper"
+FASTER_WHISPER = "faster-whisper"
+# Keys of the `audio` config section passed to the backend constructor
+SPEECH_SETTINGS = ('model_size', 'device', 'compute_type', 'cpu_threads', 'beam_size')
+
+
+class OpenAIWhisperBackend:
+    """
+    Args:
+        model_size: tiny | base | small | medium | large-v3 ...
+        device: cpu | cuda (None = CUDA if available)
+    """
+
+    name = OPENAI_WHISPER
+
+    def __init__(self, model_size: str = "base", device: Optional[str] = None, **_):
+        try:
+            import whisper  # Import only when needed
+        except ImportError:
+            raise ImportError(
+                "Whisper is not installed. Install it with: pip install openai-whisper"
+            )
+        self._whisper = whisper
+        self.model_size = model_size
+        self.model = whisper.load_model(model_size, device=device)
+        self.device = str(self.model.device)
+        self.compute_type = "float16" if self.device.startswith("cuda") else "float32"
+
+    def load_audio(self, path: str):
+        return self._whisper.load_audio(path)
+
+    def transcribe(self, audio, language: Optional[str] = None, word_timestamps: bool = False) -> Dict[str, Any]:
+        # fp16 is not supported on CPU (whisper would warn and fall back on every call)
+        return self.model.transcribe(
+            audio,
+            language=language,
+            word_timestamps=word_timestamps,
+            fp16=self.compute_type == "float16"
+        )
+
+
+class FasterWhisperBackend:
+    """
+    Args:
+        model_size: tiny | base | small | medium | large-v3 ... (or a converted model path)
+        device: cpu | cuda | auto (None = CUDA if CTranslate2 sees a GPU, else CPU)
+        compute_type: int8 | int8_float16 | float16 | float32 (int8 = quantised weights)
+        cpu_threads: CTranslate2 threads (0 = library default)
+        beam_size: Beam search width (1 = greedy, fastest)
+    """
+
+    name = FASTER_WHISPER
+
+    def __init__(
+        self,
+        model_size: str = "base",
+        device: Optional[str] = None,
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+        beam_size: int = 5,
+        **_
+    ):
+        try:
+            import faster_whisper  # Import only when needed
+        except ImportError:
+            raise ImportError(
+                "faster-whisper is not installed. Install it with: pip install faster-whisper"
+            )
+        self._faster_whisper = faster_whisper
+        self.model_size = model_size
+        self.device = device or self._default_device()
+        self.compute_type = compute_type
+        self.beam_size = beam_size
+        self.model = faster_whisper.WhisperModel(
+            model_size, device=self.device, compute_type=compute_type, cpu_threads=cpu_threads
+        )
+
+    @staticmethod
+    def _default_device() -> str:
+        """Same default as openai-whisper: CUDA when available"""
+        try:
+            import ctranslate2  # Installed with faster-whisper
+            return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        except Exception:
+            return "cpu"
+
+    def load_audio(self, path: str):
+        return self._faster_whisper.decode_audio(path, sampling_rate=16000)
+
+    def transcribe(self, audio, language: Optional[str] = None, word_timestamps: bool = False) -> Dict[str, Any]:
+        segments, info = self.model.transcribe(
+            audio, language=language, word_timestamps=word_timestamps, beam_size=self.beam_size
+        )
+        # `segments` is lazy: decoding happens while iterating
+        converted = []
+        for segment in segments:
+            converted.append({
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text,
+                'words': [
+                    {'start': word.start, 'end': word.end, 'word': word.word}
+                    for word in (segment.words or [])
+                ],
+            })
+        return {
+            'text': "".join(segment['text'] for segment in converted),
+            'language': info.language,
+            'segments': converted,
+        }
+
+
+SPEECH_BACKENDS = {
+    OPENAI_WHISPER: OpenAIWhisperBackend,
+    FASTER_WHISPER: FasterWhisperBackend,
+}
+
+
+def load_speech_backend(backend: str = OPENAI_WHISPER, **settings):
+    """Instantiate a backend by name; settings are passed to its constructor"""
+    if backend not in SPEECH_BACKENDS:
+        raise ValueError(f"Unknown speech backend '{backend}' (available: {', '.join(SPEECH_BACKENDS)})")
+    instance = SPEECH_BACKENDS[backend](**settings)
+    logger.info(f"✅ Speech backend {backend} loaded ({instance.model_size}, {instance.device}, {instance.compute_type})")
+    return instance
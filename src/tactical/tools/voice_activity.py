@@ -0,0 +1,206 @@
+"""
+Voice activity detection (VAD) for radio recordings.
+
+Radio captures are mostly squelch, carrier noise and silence. The detector
+works on non-overlapping frames with two vectorised features:
+    - energy (dBFS) above an adaptive noise floor (a low percentile of the file)
+    - spectral flatness in the speech band: noise bursts (squelch tails, hiss)
+      are flat, voiced speech is not
+Speech frames are padded, short pauses bridged and blips dropped; the result
+is a SpeechMap that compacts the audio to its speech regions and maps times in
+the compacted audio back to the original recording.
+"""
+
+import bisect
+import logging
+from typing import List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SpeechMap:
+    """Speech regions of one recording and the mapping compacted <-> original timeline"""
+
+    def __init__(self, regions: List[Tuple[int, int]], total_samples: int, sample_rate: int):
+        self.regions = regions  # (start, end) sample indices in the original audio
+        self.total_samples = total_samples
+        self.sample_rate = sample_rate
+        # Start of each region in the original / compacted audio (seconds)
+        self._original_starts = [start / sample_rate for start, _ in regions]
+        self._compact_starts = []
+        position = 0
+        for start, end in regions:
+            self._compact_starts.append(position / sample_rate)
+            position += end - start
+        self.speech_samples = position
+
+    @property
+    def total_seconds(self) -> float:
+        return self.total_samples / self.sample_rate
+
+    @property
+    def speech_seconds(self) -> float:
+        return self.speech_samples / self.sample_rate
+
+    @property
+    def saved_seconds(self) -> float:
+        return self.total_seconds - self.speech_seconds
+
+    @property
+    def trimmed(self) -> bool:
+        return self.speech_samples < self.total_samples
+
+    def compact(self, audio: np.ndarray) -> np.ndarray:
+        """Audio with the dead air cut out (the original array when nothing was cut)"""
+        if not self.trimmed:
+            return audio
+        if not self.regions:
+            return audio[:0]
+        return np.concatenate([audio[start:end] for start, end in self.regions])
+
+    def to_original(self, seconds: float, end: bool = False) -> float:
+        """
+        Time in the compacted audio -> time in the original recording.
+        With `end`, a time on a cut belongs to the region before it (turn ends).
+        """
+        if not self.regions:
+            return seconds
+        locate = bisect.bisect_left if end else bisect.bisect_right
+        index = max(0, locate(self._compact_starts, seconds) - 1)
+        return self._original_starts[index] + seconds - self._compact_starts[index]
+
+    def to_compact(self, seconds: float) -> float:
+        """Time in the original recording -> compacted audio (times in cut dead air snap to the cut)"""
+        if not self.regions:
+            return seconds
+        index = bisect.bisect_right(self._original_starts, seconds) - 1
+        if index < 0:
+            return 0.0
+        start, end = self.regions[index]
+        offset = min(seconds - self._original_starts[index], (end - start) / self.sample_rate)
+        return self._compact_starts[index] + offset
+
+    def map_turns(self, turns: List[Tuple[float, float, str]]) -> List[Tuple[float, float, str]]:
+        """Turns (start, end, speaker) on the compacted timeline -> original timeline"""
+        return [(self.to_original(start), self.to_original(end, end=True), speaker)
+                for start, end, speaker in turns]
+
+    def compact_turns(self, turns: List[Tuple[float, float, str]]) -> List[Tuple[float, float, str]]:
+        """Turns (start, end, speaker) on the original timeline -> compacted timeline (for slicing)"""
+        return [(self.to_compact(start), self.to_compact(end), speaker) for start, end, speaker in turns]
+
+    def format_regions(self, limit: int = 10) -> str:
+        """"0:03.2-0:15.8, 0:41.0-0:52.4, ..." on the original timeline"""
+        def clock(samples):
+            seconds = samples / self.sample_rate
+            return f"{int(seconds // 60)}:{seconds % 60:04.1f}"
+        shown = [f"{clock(start)}-{clock(end)}" for start, end in self.regions[:limit]]
+        if len(self.regions) > limit:
+            shown.append(f"... ({len(self.regions) - limit} more)")
+        return ", ".join(shown) or "none"
+
+    def summary(self) -> str:
+        percent = 100.0 * self.saved_seconds / self.total_seconds if self.total_seconds else 0.0
+        return (f"{self.speech_seconds:.1f}s of speech in {self.total_seconds:.1f}s "
+                f"({self.saved_seconds:.1f}s / {percent:.0f}% dead air skipped)")
+
+
+class VoiceActivityDetector:
+    """
+    Args:
+        sample_rate: Rate of the audio passed to detect()
+        frame_ms: Analysis frame length
+        energy_margin_db: Speech must be this far above the noise floor
+        noise_percentile: Percentile of frame energies taken as the noise floor
+        min_energy_db: Frames below this (dBFS) are never speech
+        min_dynamic_range_db: Files whose loud-to-floor energy spread is smaller than
+            this have no dead air to find (continuous AGC'd speech, a steady tone):
+            they are kept whole instead of being judged against their own level
+        flatness_max: Frames with a flatter spectrum (0..1) are treated as noise
+        min_speech_ms: Shorter speech regions are dropped
+        min_silence_ms: Shorter pauses between speech regions are bridged
+        padding_ms: Kept before and after each region (word onsets / tails)
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: float = 30,
+        energy_margin_db: float = 12.0,
+        noise_percentile: float = 10.0,
+        min_energy_db: float = -55.0,
+        min_dynamic_range_db: float = 15.0,
+        flatness_max: float = 0.35,
+        min_speech_ms: float = 200,
+        min_silence_ms: float = 300,
+        padding_ms: float = 150
+    ):
+        self.sample_rate = sample_rate
+        self.frame = max(1, int(sample_rate * frame_ms / 1000))
+        self.energy_margin_db = energy_margin_db
+        self.noise_percentile = noise_percentile
+        self.min_energy_db = min_energy_db
+        self.min_dynamic_range_db = min_dynamic_range_db
+        self.flatness_max = flatness_max
+        self.min_speech_frames = max(1, int(round(min_speech_ms / frame_ms)))
+        self.min_silence_frames = int(round(min_silence_ms / frame_ms))
+        self.padding_frames = int(round(padding_ms / frame_ms))
+
+        # Speech band bins of the frame spectrum (300-3400 Hz, the radio voice channel)
+        frequencies = np.fft.rfftfreq(self.frame, d=1.0 / sample_rate)
+        self._band = (frequencies >= 300) & (frequencies <= 3400)
+        self._window = np.hanning(self.frame).astype(np.float32)
+
+    def speech_frames(self, audio: np.ndarray) -> np.ndarray:
+        """Boolean speech decision per frame (before smoothing)"""
+        count = len(audio) // self.frame
+        if count == 0:
+            return np.zeros(0, dtype=bool)
+        frames = audio[:count * self.frame].reshape(count, self.frame)
+
+        energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        floor = np.percentile(energy_db, self.noise_percentile)
+        if np.percentile(energy_db, 95) - floor < self.min_dynamic_range_db:
+            # No quiet stretches to tell apart: the floor is the signal itself
+            return np.ones(count, dtype=bool)
+        threshold = max(floor + self.energy_margin_db, self.min_energy_db)
+        loud = energy_db > threshold
+
+        power = np.abs(np.fft.rfft(frames * self._window, axis=1))[:, self._band] ** 2 + 1e-12
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+        return loud & (flatness < self.flatness_max)
+
+    def _runs(self, decisions: np.ndarray) -> List[Tuple[int, int]]:
+        """(start, end) frame indices of the True runs"""
+        edges = np.diff(np.concatenate(([0], decisions.astype(np.int8), [0])))
+        return list(zip(np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist()))
+
+    def detect(self, audio: np.ndarray) -> SpeechMap:
+        decisions = self.speech_frames(audio)
+        count = len(decisions)
+
+        # Bridge short pauses, drop blips, then pad (padded regions may touch)
+        regions = []
+        for start, end in self._runs(decisions):
+            if regions and start - regions[-1][1] <= self.min_silence_frames:
+                regions[-1] = (regions[-1][0], end)
+            else:
+                regions.append((start, end))
+        padded = []
+        for start, end in regions:
+            if end - start < self.min_speech_frames:
+                continue
+            start, end = max(0, start - self.padding_frames), min(count, end + self.padding_frames)
+            if padded and start <= padded[-1][1]:
+                padded[-1] = (padded[-1][0], end)
+            else:
+                padded.append((start, end))
+        regions = padded
+
+        samples = [(start * self.frame, end * self.frame) for start, end in regions]
+        # The partial frame at the end belongs to a region that reaches the last frame
+        if samples and regions[-1][1] == count:
+            samples[-1] = (samples[-1][0], len(audio))
+        return SpeechMap(samples, len(audio), self.sample_rate)
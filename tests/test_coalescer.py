@@ -0,0 +1,57 @@
+import threading
+
+from mqtt.coalescer import AlertCoalescer
+
+
+def alarm(payload):
+    return {'topic': "sensors/perimeter", 'payload': payload, 'priority': 'normal', 'count': 1}
+
+
+def collector():
+    emitted, summary = [], threading.Event()
+
+    def on_flush(alert):
+        emitted.append(alert)
+        if alert.get('summary'):
+            summary.set()
+    return emitted, summary, on_flush
+
+
+def test_first_alarm_is_emitted_immediately_and_repeats_are_summarised():
+    emitted, summary, on_flush = collector()
+    coalescer = AlertCoalescer(on_flush, window_seconds=0.2)
+    coalescer.start()
+    fields = {'asset_id': "cam-3", 'alarm_id': "motion"}
+
+    assert coalescer.add(alarm("first"), dict(fields, timestamp="t1"))
+    # Leading edge: out before the window closes
+    assert [alert['payload'] for alert in emitted] == ["first"]
+    assert emitted[0]['count'] == 1 and not emitted[0].get('summary')
+
+    coalescer.add(alarm("second"), dict(fields, timestamp="t2"))
+    coalescer.add(alarm("third"), dict(fields, timestamp="t3"))
+    assert len(emitted) == 1
+
+    assert summary.wait(5)
+    coalescer.stop()
+    update = emitted[1]
+    assert update['payload'] == "third" and update['count'] == 2
+    assert (update['first_timestamp'], update['last_timestamp']) == ("t2", "t3")
+    assert coalescer.snapshot()['flushed'] == 2
+
+
+def test_unrepeated_alarm_emits_nothing_when_its_window_closes():
+    emitted, _, on_flush = collector()
+    coalescer = AlertCoalescer(on_flush, window_seconds=0.05)
+    coalescer.start()
+
+    coalescer.add(alarm("only"), {'asset_id': "cam-3", 'alarm_id': "motion"})
+    coalescer.stop(flush=True)
+
+    assert [alert['payload'] for alert in emitted] == ["only"]
+
+
+def test_free_text_alerts_are_not_coalesced():
+    coalescer = AlertCoalescer(lambda alert: None)
+
+    assert not coalescer.add(alarm("free text"), {})
@@ -0,0 +1,50 @@
+import json
+from types import SimpleNamespace
+
+from mqtt.result_publisher import ResultPublisher
+
+MQTT_ERR_NO_CONN = 4
+
+
+def mission(ok=True):
+    return SimpleNamespace(run_id="run-1", timings={'threat_analysis_task': 1.25}, ok=ok,
+                           error=None if ok else "boom", duration=2.0, output_dir="output/runs/run-1")
+
+
+def alert():
+    return {'topic': "Canal 1", 'priority': 'high', 'count': 3}
+
+
+def test_stages_and_status_are_published_as_json():
+    sent = []
+    publisher = ResultPublisher(lambda topic, payload, qos, retain: sent.append((topic, json.loads(payload), qos))
+                                or SimpleNamespace(rc=0))
+
+    on_stage = publisher.stage_callback(alert())
+    on_stage(mission(), 'threat_analysis_task', "analysis")
+    on_stage(mission(), 'unknown_task', "ignored")
+    publisher.publish_status(mission(), alert(), on_stage)
+
+    assert [topic for topic, _, _ in sent] == ["tactical/results/threat_analysis", "tactical/results/status"]
+    stage, status = sent[0][1], sent[1][1]
+    assert stage['output'] == "analysis" and stage['occurrences'] == 3 and stage['run_id'] == "run-1"
+    assert status['stage'] == 'status' and status['ok'] is True and status['duration'] == 2.0
+    assert publisher.snapshot() == {'published': 2, 'failed': 0}
+
+
+def test_failing_return_code_counts_as_failed():
+    publisher = ResultPublisher(lambda topic, payload, qos, retain: SimpleNamespace(rc=MQTT_ERR_NO_CONN))
+
+    publisher.publish_status(mission(), alert())
+
+    assert publisher.snapshot() == {'published': 0, 'failed': 1}
+
+
+def test_raising_publish_counts_as_failed():
+    def publish(topic, payload, qos, retain):
+        raise OSError("broken pipe")
+
+    publisher = ResultPublisher(publish, max_output_chars=5)
+    publisher.stage_callback(alert())(mission(), 'report_generation_task', "a long SITREP")
+
+    assert publisher.snapshot() == {'published': 0, 'failed': 1}
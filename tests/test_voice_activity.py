@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from src.tactical.tools.voice_activity import SpeechMap, VoiceActivityDetector
+
+SAMPLE_RATE = 16000
+
+
+def voice(seconds, depth=1.0):
+    """Harmonic 'voice' with a 4 Hz syllable envelope (depth 0 = perfectly steady level)"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    harmonics = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 15))
+    envelope = 1.0 - depth * (1 - np.sin(2 * np.pi * 4 * t)) / 2
+    return (0.1 * harmonics * envelope).astype(np.float32)
+
+
+def test_continuous_speech_is_kept_whole():
+    # AGC-compressed radio: speech all the way through, no quiet floor to compare against
+    audio = voice(20, depth=0.2)
+    speech_map = VoiceActivityDetector().detect(audio)
+
+    assert speech_map.regions == [(0, len(audio))]
+    assert speech_map.saved_seconds == 0
+    assert speech_map.compact(audio) is audio
+
+
+def test_constant_tone_is_kept_whole():
+    t = np.arange(10 * SAMPLE_RATE) / SAMPLE_RATE
+    audio = (0.3 * np.sin(2 * np.pi * 1000 * t)).astype(np.float32)
+
+    assert VoiceActivityDetector().detect(audio).regions == [(0, len(audio))]
+
+
+def test_dead_air_and_squelch_are_cut():
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(60 * SAMPLE_RATE) * 0.002).astype(np.float32)
+    for second in (5, 35):
+        audio[second * SAMPLE_RATE:(second + 3) * SAMPLE_RATE] += voice(3)
+    burst = (rng.standard_normal(int(0.4 * SAMPLE_RATE)) * 0.2).astype(np.float32)
+    audio[20 * SAMPLE_RATE:20 * SAMPLE_RATE + len(burst)] += burst  # squelch tail
+
+    speech_map = VoiceActivityDetector().detect(audio)
+
+    assert len(speech_map.regions) == 2
+    starts = [start / SAMPLE_RATE for start, _ in speech_map.regions]
+    assert starts[0] == pytest.approx(5, abs=0.3) and starts[1] == pytest.approx(35, abs=0.3)
+    assert speech_map.saved_seconds > 50
+
+
+def test_turns_map_between_compacted_and_original_timeline():
+    # Speech at 10-12 s and 40-43 s of a 60 s recording -> 5 s of compacted audio
+    speech_map = SpeechMap([(10 * SAMPLE_RATE, 12 * SAMPLE_RATE), (40 * SAMPLE_RATE, 43 * SAMPLE_RATE)],
+                           60 * SAMPLE_RATE, SAMPLE_RATE)
+
+    # Same speaker back to back after compaction, 28 s apart in the recording
+    original = speech_map.map_turns([(0.0, 2.0, "A"), (2.0, 5.0, "A")])
+    assert original == [(10.0, 12.0, "A"), (40.0, 43.0, "A")]
+
+    assert speech_map.compact_turns(original) == [(0.0, 2.0, "A"), (2.0, 5.0, "A")]
+    # A time inside the cut dead air snaps to the cut
+    assert speech_map.to_compact(25.0) == pytest.approx(2.0)
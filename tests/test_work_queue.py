@@ -0,0 +1,71 @@
+import threading
+
+from mqtt.work_queue import BLOCK, DROP_OLDEST, REJECT, WorkQueue
+
+CLASSES = ['critical', 'high', 'normal', 'low']
+
+
+def full_queue(overflow, priority, size=3):
+    """Queue (workers not started) filled with `size` items of one class"""
+    queue = WorkQueue(lambda item: None, max_size=size, overflow=overflow, block_timeout=0.05, classes=CLASSES)
+    for index in range(size):
+        assert queue.submit(f"{priority}-{index}", priority=priority)
+    return queue
+
+
+def queued(queue):
+    return {name: [item for _, item in queue._queues[rank]] for rank, name in enumerate(queue.classes)}
+
+
+def test_drop_oldest_never_evicts_more_urgent_work():
+    queue = full_queue(DROP_OLDEST, 'critical')
+
+    assert not queue.submit("low-new", priority='low')
+
+    assert queued(queue)['critical'] == ["critical-0", "critical-1", "critical-2"]
+    assert queue.dropped == 1 and queue.preempted == 0 and queue.rejected == 0
+
+
+def test_drop_oldest_never_evicts_the_same_class():
+    queue = full_queue(DROP_OLDEST, 'normal')
+
+    assert not queue.submit("normal-new", priority='normal')
+
+    assert queued(queue)['normal'] == ["normal-0", "normal-1", "normal-2"]
+    assert queue.dropped == 1
+
+
+def test_more_urgent_item_preempts_oldest_lower_class_item():
+    queue = full_queue(REJECT, 'low')
+
+    assert queue.submit("critical-new", priority='critical')
+
+    assert queued(queue)['low'] == ["low-1", "low-2"]
+    assert queued(queue)['critical'] == ["critical-new"]
+    assert queue.preempted == 1 and queue.rejected == 0
+
+
+def test_block_rejects_after_timeout_and_reject_refuses():
+    for overflow in (BLOCK, REJECT):
+        queue = full_queue(overflow, 'high')
+
+        assert not queue.submit("high-new", priority='high')
+        assert queue.rejected == 1 and queue.dropped == 0
+
+
+def test_workers_take_the_most_urgent_item_first():
+    order, done = [], threading.Event()
+
+    def handler(item):
+        order.append(item)
+        if len(order) == 3:
+            done.set()
+
+    queue = WorkQueue(handler, max_size=10, workers=1, classes=CLASSES)
+    for item, priority in (("low", 'low'), ("normal", 'normal'), ("critical", 'critical')):
+        queue.submit(item, priority=priority)
+    queue.start()
+
+    assert done.wait(5)
+    queue.stop()
+    assert order == ["critical", "normal", "low"]